@@ -0,0 +1,267 @@
+"""Benchmark encode/decode lsbstego pada berbagai ukuran, format, dan payload.
+
+Carrier dibuat otomatis (noise acak dengan seed tetap) lalu setiap kasus
+dijalankan di proses baru agar peak RSS bisa diukur per kasus. Hasil ditulis
+sebagai JSON dan bisa dibandingkan dengan baseline tersimpan:
+
+    python benchmarks/bench_codec.py --quick -o hasil.json
+    python benchmarks/bench_codec.py --baseline baseline.json --threshold 0.2
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import string
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+import PIL  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from lsbstego import (HEADER_SIZE, decode_image, decode_mapped, decode_stream,  # noqa: E402
+                      encode_image, encode_mapped, encode_stream)
+
+SIZES = {
+    "256": (256, 256),
+    "1024": (1024, 1024),
+    "4k": (3840, 2160),
+    "8k": (7680, 4320),
+    "16k": (15360, 8640),
+}
+QUICK_SIZES = ["256", "1024"]
+DEFAULT_SIZES = ["256", "1024", "4k", "8k"]
+
+# Format carrier: ekstensi file dan mode Pillow
+FORMATS = {
+    "png": (".png", "RGB"),
+    "bmp": (".bmp", "RGB"),
+    "rgba": (".png", "RGBA"),
+    "palette": (".png", "P"),
+}
+
+# Ukuran payload: byte tetap atau pecahan dari kapasitas 1-bit RGB
+PAYLOADS = {"tiny": 16, "1pct": 0.01, "50pct": 0.5, "full": 0.98}
+
+# Engine yang dibandingkan dan format yang didukung masing-masing
+ENGINES = {
+    "memory": ("png", "bmp", "rgba", "palette"),
+    "stream": ("png", "rgba", "palette"),
+    "mmap": ("bmp",),
+}
+
+
+def make_carrier(directory, size_name, fmt):
+    """Membuat (atau memakai ulang) carrier noise acak untuk ukuran dan format tertentu."""
+    ext, mode = FORMATS[fmt]
+    path = os.path.join(directory, f"carrier_{size_name}_{fmt}{ext}")
+    if not os.path.exists(path):
+        width, height = SIZES[size_name]
+        rng = np.random.default_rng(1234)
+        img = Image.fromarray(rng.integers(0, 256, (height, width, 3), dtype=np.uint8))
+        if mode == "P":
+            img = img.quantize(256)
+        else:
+            img = img.convert(mode)
+        if ext == ".png":
+            img.save(path, compress_level=1)
+        else:
+            img.save(path)
+    return path
+
+
+def payload_size(name, width, height):
+    """Jumlah byte payload untuk sebuah nama ukuran payload."""
+    spec = PAYLOADS[name]
+    capacity = width * height * 3 // 8 - HEADER_SIZE
+    size = spec if isinstance(spec, int) else int(capacity * spec)
+    return max(1, min(size, capacity))
+
+
+def make_message(nbytes, seed=42):
+    """Teks ASCII acak (deterministik) sepanjang ``nbytes``."""
+    rnd = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits + " "
+    return "".join(rnd.choices(alphabet, k=nbytes))
+
+
+def percentile(samples, q):
+    """Persentil dengan metode nearest-rank."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(q / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def summarize(samples):
+    return {
+        "p50": percentile(samples, 50),
+        "p99": percentile(samples, 99),
+        "mean": sum(samples) / len(samples),
+        "min": min(samples),
+    }
+
+
+def run_case(case, repeat, workdir):
+    """Menjalankan satu kasus di proses worker dan mengukur latensi serta peak RSS."""
+    engine, fmt, carrier = case["engine"], case["format"], case["carrier"]
+    message = make_message(case["payload_bytes"])
+    output = os.path.join(workdir, f"out_{os.getpid()}" + (".bmp" if engine == "mmap" else ".png"))
+
+    if engine == "memory":
+        def encode():
+            encode_image(carrier, message).save(output)
+        decode = lambda: decode_image(output)  # noqa: E731
+    elif engine == "stream":
+        def encode():
+            encode_stream(carrier, output, message)
+        decode = lambda: decode_stream(output)  # noqa: E731
+    else:
+        def encode():
+            encode_mapped(carrier, message, output)
+        decode = lambda: decode_mapped(output)  # noqa: E731
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    encode_times, decode_times = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encode()
+        encode_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        result = decode()
+        decode_times.append(time.perf_counter() - start)
+        if result != message:
+            raise AssertionError(f"{case['id']}: hasil decode tidak sama dengan pesan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    os.remove(output)
+
+    pixels = case["width"] * case["height"]
+    carrier_mb = pixels * 3 / 1e6
+    encode_stats, decode_stats = summarize(encode_times), summarize(decode_times)
+    return dict(
+        case,
+        encode=encode_stats,
+        decode=decode_stats,
+        encode_pixels_per_s=pixels / encode_stats["p50"],
+        decode_pixels_per_s=pixels / decode_stats["p50"],
+        encode_mb_per_s=carrier_mb / encode_stats["p50"],
+        decode_mb_per_s=carrier_mb / decode_stats["p50"],
+        payload_mb_per_s=case["payload_bytes"] / 1e6 / encode_stats["p50"],
+        # ru_maxrss dalam KB di Linux
+        peak_rss_mb=peak / 1024,
+        rss_growth_mb=(peak - rss_before) / 1024,
+    )
+
+
+def build_cases(sizes, formats, payloads, engines, workdir):
+    cases = []
+    for size_name in sizes:
+        width, height = SIZES[size_name]
+        for fmt in formats:
+            carrier = None
+            for engine in engines:
+                if fmt not in ENGINES[engine]:
+                    continue
+                carrier = carrier or make_carrier(workdir, size_name, fmt)
+                for payload in payloads:
+                    cases.append({
+                        "id": f"{engine}/{fmt}/{size_name}/{payload}",
+                        "engine": engine,
+                        "format": fmt,
+                        "size": size_name,
+                        "width": width,
+                        "height": height,
+                        "payload": payload,
+                        "payload_bytes": payload_size(payload, width, height),
+                        "carrier": carrier,
+                    })
+    return cases
+
+
+def compare(results, baseline, threshold):
+    """Mencari kasus yang p50-nya lebih lambat dari baseline melebihi ``threshold``."""
+    previous = {r["id"]: r for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        old = previous.get(r["id"])
+        if not old:
+            continue
+        for stage in ("encode", "decode"):
+            ratio = r[stage]["p50"] / old[stage]["p50"]
+            if ratio > 1 + threshold:
+                regressions.append({"id": r["id"], "stage": stage, "ratio": ratio,
+                                    "p50": r[stage]["p50"], "baseline_p50": old[stage]["p50"]})
+    return regressions
+
+
+def metadata(repeat):
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pillow": PIL.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "repeat": repeat,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=None)
+    parser.add_argument("--formats", nargs="+", choices=list(FORMATS), default=list(FORMATS))
+    parser.add_argument("--payloads", nargs="+", choices=list(PAYLOADS), default=list(PAYLOADS))
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=list(ENGINES))
+    parser.add_argument("--repeat", type=int, default=5, help="pengulangan per kasus (default: 5)")
+    parser.add_argument("--quick", action="store_true", help="hanya ukuran kecil (256 dan 1024)")
+    parser.add_argument("--workdir", help="direktori carrier (default: direktori sementara)")
+    parser.add_argument("-o", "--output", help="tulis JSON ke file alih-alih stdout")
+    parser.add_argument("--baseline", help="file JSON hasil sebelumnya untuk deteksi regresi")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="batas perlambatan p50 relatif terhadap baseline (default: 0.2)")
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes or (QUICK_SIZES if args.quick else DEFAULT_SIZES)
+    workdir = args.workdir or tempfile.mkdtemp(prefix="lsbstego-bench-")
+    os.makedirs(workdir, exist_ok=True)
+    cases = build_cases(sizes, args.formats, args.payloads, args.engines, workdir)
+
+    results = []
+    # Satu proses baru per kasus agar peak RSS tidak terbawa dari kasus sebelumnya
+    # (executor baru per kasus; max_tasks_per_child baru ada di Python 3.11)
+    context = multiprocessing.get_context("spawn")
+    for case in cases:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            result = pool.submit(run_case, case, args.repeat, workdir).result()
+        results.append(result)
+        print(f"{result['id']:<32} enc p50 {result['encode']['p50'] * 1000:9.2f} ms  "
+              f"dec p50 {result['decode']['p50'] * 1000:9.2f} ms  "
+              f"{result['encode_mb_per_s']:8.1f} MB/s  rss {result['peak_rss_mb']:7.1f} MB",
+              file=sys.stderr)
+
+    report = {"meta": metadata(args.repeat), "results": results}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            report["regressions"] = compare(results, json.load(f), args.threshold)
+        for reg in report["regressions"]:
+            print(f"REGRESI {reg['id']} {reg['stage']}: {reg['ratio']:.2f}x lebih lambat",
+                  file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""Benchmark biaya dan daya pulih lapisan ECC per skema.
+
+Untuk tiap skema diukur waktu encode/decode per MB payload (p50 dari
+beberapa pengulangan) dan rasio ukuran. Setelah itu tiap skema diuji dengan
+LSB yang dibalik acak pada beberapa laju galat: dilaporkan berapa percobaan
+yang pulih utuh (CRC cocok) dan waktu decode-nya:
+
+    python benchmarks/bench_ecc.py --mb 8 -o ecc.json
+    python benchmarks/bench_ecc.py --error-rates 0.0001 0.001 0.01 --trials 20
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from bench_codec import metadata, summarize  # noqa: E402
+from lsbstego import StegoError, decode_pixels, encode_pixels  # noqa: E402
+from lsbstego.ecc import ECC_IDS, decode_bits, encode_bits  # noqa: E402
+
+
+def measure_cost(scheme, mb, repeat, rng):
+    """Waktu encode/decode per MB payload untuk satu skema."""
+    bits = rng.integers(0, 2, mb * 8 << 20, dtype=np.uint8)
+    encode_times, decode_times = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        coded = encode_bits(bits, scheme)
+        encode_times.append((time.perf_counter() - start) / mb)
+        start = time.perf_counter()
+        decode_bits(coded, len(bits), scheme)
+        decode_times.append((time.perf_counter() - start) / mb)
+    return {"encode_s_per_mb": summarize(encode_times),
+            "decode_s_per_mb": summarize(decode_times),
+            "expansion": len(coded) / len(bits)}
+
+
+def measure_recovery(scheme, error_rate, trials, side, message, rng):
+    """Persentase payload yang pulih setelah LSB dibalik acak dengan laju ``error_rate``."""
+    carrier = rng.integers(0, 256, (side, side, 3), dtype=np.uint8)
+    encode_pixels(carrier, message, ecc=scheme)
+    recovered, times = 0, []
+    for _ in range(trials):
+        damaged = carrier.copy()
+        flat = damaged.reshape(-1)
+        flips = rng.random(flat.size) < error_rate
+        flat[flips] ^= 1
+        start = time.perf_counter()
+        try:
+            recovered += decode_pixels(damaged) == message
+        except StegoError:
+            pass  # header tidak terbaca atau CRC tidak cocok
+        times.append(time.perf_counter() - start)
+    return {"error_rate": error_rate, "recovered": recovered / trials,
+            "decode_seconds": summarize(times)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--schemes", nargs="+", choices=["none"] + list(ECC_IDS),
+                        default=["none"] + list(ECC_IDS))
+    parser.add_argument("--mb", type=int, default=4, help="ukuran payload uji biaya (MB)")
+    parser.add_argument("--error-rates", nargs="+", type=float, default=[1e-4, 1e-3, 1e-2])
+    parser.add_argument("--trials", type=int, default=10, help="percobaan per laju galat")
+    parser.add_argument("--side", type=int, default=512, help="sisi carrier uji pemulihan")
+    parser.add_argument("--repeat", type=int, default=3, help="pengulangan uji biaya (default: 3)")
+    parser.add_argument("-o", "--output", help="tulis JSON ke file alih-alih stdout")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(1234)
+    message = bytes(rng.integers(0, 256, args.side * args.side * 3 // 8 // 6, dtype=np.uint8))
+    results = []
+    for scheme in args.schemes:
+        ecc = None if scheme == "none" else scheme
+        result = {"scheme": scheme}
+        if ecc:
+            result.update(measure_cost(ecc, args.mb, args.repeat, rng))
+            print(f"{scheme:<8} encode {result['encode_s_per_mb']['p50'] * 1000:7.1f} ms/MB  "
+                  f"decode {result['decode_s_per_mb']['p50'] * 1000:7.1f} ms/MB  "
+                  f"x{result['expansion']:.2f}", file=sys.stderr)
+        result["recovery"] = [measure_recovery(ecc, rate, args.trials, args.side, message, rng)
+                              for rate in args.error_rates]
+        for row in result["recovery"]:
+            print(f"{scheme:<8} galat {row['error_rate']:<8g} pulih {row['recovered']:6.0%}  "
+                  f"decode p50 {row['decode_seconds']['p50'] * 1000:7.1f} ms", file=sys.stderr)
+        results.append(result)
+
+    report = {"meta": dict(metadata(args.repeat), payload_bytes=len(message), side=args.side),
+              "results": results}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
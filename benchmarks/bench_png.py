@@ -0,0 +1,108 @@
+"""Benchmark penyimpanan PNG hasil encode untuk berbagai level, strategi, filter, dan thread.
+
+Tiap kombinasi disimpan beberapa kali dari gambar yang sama (carrier buatan
+mirip foto, atau ``--image``), lalu dilaporkan waktu p50, throughput, dan
+ukuran file agar pertukaran ukuran vs kecepatan terlihat jelas:
+
+    python benchmarks/bench_png.py --size 4k --threads 1 0 -o png.json
+    python benchmarks/bench_png.py --image foto.png --filters pillow up adaptive
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from bench_codec import SIZES, metadata, summarize  # noqa: E402
+from lsbstego import encode_image  # noqa: E402
+from lsbstego.pngout import FILTERS, STRATEGIES, save_image  # noqa: E402
+
+# "pillow" berarti penyimpanan lewat Pillow (filter adaptif milik libpng-nya)
+FILTER_CHOICES = ("pillow",) + FILTERS
+
+
+def make_photo(path, size_name):
+    """Carrier mirip foto: gradien halus ditambah noise ringan (seed tetap)."""
+    width, height = SIZES[size_name]
+    rng = np.random.default_rng(1234)
+    yy, xx = np.mgrid[:height, :width].astype(np.float32)
+    base = np.stack((xx / width, yy / height, (xx + yy) / (width + height)), axis=-1) * 255
+    noise = rng.normal(0, 6, (height, width, 3)).astype(np.float32)
+    Image.fromarray(np.clip(base + noise, 0, 255).astype(np.uint8)).save(path, compress_level=1)
+    return path
+
+
+def run_setting(img, output, setting, repeat):
+    """Menyimpan ``img`` ``repeat`` kali dengan satu kombinasi opsi dan mengukur hasilnya."""
+    options = {"compress_level": setting["level"], "strategy": setting["strategy"],
+               "threads": setting["threads"]}
+    if setting["filter"] != "pillow":
+        options["filter_type"] = setting["filter"]
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        save_image(img, output, **options)
+        times.append(time.perf_counter() - start)
+    size = os.path.getsize(output)
+    raw = img.width * img.height * len(img.getbands())
+    stats = summarize(times)
+    return dict(setting, seconds=stats, bytes=size, ratio=size / raw,
+                mb_per_s=raw / 1e6 / stats["p50"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--image", help="carrier sendiri (default: carrier buatan)")
+    parser.add_argument("--size", choices=list(SIZES), default="1024",
+                        help="ukuran carrier buatan (default: 1024)")
+    parser.add_argument("--levels", nargs="+", type=int, default=[1, 6, 9])
+    parser.add_argument("--strategies", nargs="+", choices=list(STRATEGIES), default=["default"])
+    parser.add_argument("--filters", nargs="+", choices=FILTER_CHOICES,
+                        default=["pillow", "up", "adaptive"])
+    parser.add_argument("--threads", nargs="+", type=int, default=[1, 0],
+                        help="jumlah thread kompresi (0 = semua CPU; default: 1 0)")
+    parser.add_argument("--repeat", type=int, default=3, help="pengulangan per kombinasi (default: 3)")
+    parser.add_argument("-o", "--output", help="tulis JSON ke file alih-alih stdout")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="lsbstego-bench-png-")
+    carrier = args.image or make_photo(os.path.join(workdir, "carrier.png"), args.size)
+    img = encode_image(carrier, "benchmark")
+    output = os.path.join(workdir, "out.png")
+
+    results = []
+    for level, strategy, filter_type, threads in itertools.product(
+            args.levels, args.strategies, args.filters, args.threads):
+        if filter_type == "pillow" and threads != 1:
+            continue  # Pillow selalu satu thread
+        setting = {"level": level, "strategy": strategy, "filter": filter_type,
+                   "threads": threads}
+        result = run_setting(img, output, setting, args.repeat)
+        results.append(result)
+        print(f"level {level} {strategy:<8} {filter_type:<8} threads {threads:<2} "
+              f"p50 {result['seconds']['p50'] * 1000:9.1f} ms  {result['mb_per_s']:7.1f} MB/s  "
+              f"{result['bytes'] / 1e6:8.2f} MB ({result['ratio']:.1%})", file=sys.stderr)
+    os.remove(output)
+
+    report = {"meta": dict(metadata(args.repeat), carrier=carrier, width=img.width,
+                           height=img.height),
+              "results": results}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,20 @@
+"""Pustaka steganografi LSB tanpa ketergantungan GUI."""
+
+from .batch import collect_inputs, decode_batch, encode_batch
+from .capacity import capacity_report, image_info, payload_sizes, preflight
+from .codec import (decode_chunks, decode_image, decode_pixels, embed_bits, encode_image,
+                    encode_pixels, extract_bits, iter_lsb_bytes, read_lsb_bytes)
+from .compression import available_codecs
+from .detect import analyze_image, analyze_pixels, scan_images
+from .errors import JobCancelled, MessageTooLargeError, NoMessageError, PayloadError, StegoError
+from .frames import decode_file, decode_frames, encode_frames
+from .payload import (HEADER_SIZE, binary_to_char, build_payload, capacity_bits,
+                      char_to_binary, message_to_bits, parse_header)
+from .pngout import save_image, write_png
+from .profiling import NULL_METRICS, Metrics
+from .rawmap import MappedImage, decode_mapped, encode_mapped
+from .scatter import FeistelPermutation
+from .server import StegoServer
+from .stream import decode_stream, encode_stream
+
+__version__ = "1.0.0"
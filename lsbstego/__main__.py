@@ -0,0 +1,7 @@
+"""Entry point untuk ``python -m lsbstego``."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
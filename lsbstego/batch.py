@@ -0,0 +1,181 @@
+"""Pemrosesan batch: encode/decode banyak gambar dengan pool proses."""
+
+import glob
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .codec import encode_image
+from .frames import decode_file
+from .pngout import save_image
+from .profiling import Metrics
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tif", ".tiff", ".ppm", ".pgm", ".pnm",
+                    ".webp")
+
+
+def collect_inputs(source):
+    """Mengumpulkan daftar file dari direktori, pola glob, atau file manifest.
+
+    File manifest berisi satu path per baris; baris kosong dan baris yang
+    diawali ``#`` diabaikan, path relatif dihitung dari lokasi manifest.
+    """
+    if os.path.isdir(source):
+        names = sorted(os.listdir(source))
+        return [os.path.join(source, n) for n in names
+                if n.lower().endswith(IMAGE_EXTENSIONS)
+                and os.path.isfile(os.path.join(source, n))]
+    if glob.has_magic(source):
+        return sorted(p for p in glob.glob(source, recursive=True) if os.path.isfile(p))
+    if os.path.isfile(source) and not source.lower().endswith(IMAGE_EXTENSIONS):
+        base = os.path.dirname(source)
+        paths = []
+        with open(source, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    paths.append(line if os.path.isabs(line) else os.path.join(base, line))
+        return paths
+    return [source]
+
+
+def output_path_for(path, output_dir):
+    """Nama file hasil encode, sama seperti default di GUI."""
+    filename = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(output_dir, f"{filename}_encoded.png")
+
+
+def output_paths(inputs, output_dir):
+    """Nama file hasil encode untuk tiap input.
+
+    Subdirektori relatif terhadap direktori induk bersama semua input
+    dicerminkan di ``output_dir``, sehingga ``d1/a.png`` dan ``d2/a.png``
+    tidak saling menimpa. Input dari satu direktori tetap memakai nama GUI.
+    """
+    if not inputs:
+        return []
+    dirs = [os.path.dirname(os.path.abspath(path)) for path in inputs]
+    root = os.path.commonpath(dirs)
+    return [os.path.normpath(output_path_for(path, os.path.join(output_dir,
+                                                                 os.path.relpath(d, root))))
+            for path, d in zip(inputs, dirs)]
+
+
+def _encode_one(path, output, message, options, png_options, profile):
+    start = time.perf_counter()
+    metrics = Metrics() if profile else None
+    result = {"path": path, "output": output, "ok": True, "error": None}
+    try:
+        img = encode_image(path, message, metrics=metrics, **options)
+        save_image(img, output, metrics=metrics, **png_options)
+    except Exception as e:
+        result.update(ok=False, output=None, error=f"{type(e).__name__}: {e}")
+    result["seconds"] = time.perf_counter() - start
+    if metrics is not None:
+        result["metrics"] = metrics.to_dict()
+    return result
+
+
+def _decode_one(path, profile, key=None):
+    start = time.perf_counter()
+    metrics = Metrics() if profile else None
+    result = {"path": path, "ok": True, "message": None, "error": None}
+    try:
+        result["message"] = decode_file(path, metrics=metrics, key=key)
+    except Exception as e:
+        result.update(ok=False, error=f"{type(e).__name__}: {e}")
+    result["seconds"] = time.perf_counter() - start
+    if metrics is not None:
+        result["metrics"] = metrics.to_dict()
+    return result
+
+
+def _encode_chunk(tasks, message, options, png_options, profile):
+    return [_encode_one(path, output, message, options, png_options, profile)
+            for path, output in tasks]
+
+
+def _decode_chunk(paths, profile, key=None):
+    return [_decode_one(path, profile, key) for path in paths]
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def run_chunks(func, chunks, args=(), workers=None, max_pending=None):
+    """Menjalankan ``func(chunk, *args)`` di pool proses dan menghasilkan hasilnya.
+
+    Jumlah chunk yang sedang berjalan atau menunggu dibatasi ``max_pending``
+    (default dua kali jumlah worker), sehingga jumlah gambar yang ter-decode
+    di memori pada satu waktu tetap terbatas berapa pun ukuran batch-nya.
+    Hasil dikembalikan sesuai urutan selesai.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in chunks:
+            yield from func(chunk, *args)
+        return
+    max_pending = max_pending or workers * 2
+    chunks = iter(chunks)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for chunk in chunks:
+            pending.add(pool.submit(func, chunk, *args))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        for future in pending:
+            yield from future.result()
+
+
+def encode_batch(inputs, message, output_dir, workers=None, chunksize=1,
+                 max_pending=None, legacy=False, bits_per_channel=1, alpha=False,
+                 compression=None, level=None, profile=False, png_options=None, key=None,
+                 ecc=None):
+    """Menyisipkan pesan yang sama ke banyak gambar.
+
+    Mengembalikan daftar dict per file (``path``, ``output``, ``ok``,
+    ``error``, ``seconds``) dengan urutan yang sama seperti ``inputs``.
+    Dengan ``profile=True`` tiap hasil juga memuat ``metrics`` per tahap.
+    ``png_options`` diteruskan ke :func:`lsbstego.pngout.save_image`
+    (``compress_level``, ``strategy``, ``filter_type``, ``optimize``,
+    ``threads``) untuk menukar ukuran file dengan kecepatan. Input yang
+    nama hasilnya bentrok dengan input sebelumnya (mis. ``a.png`` dan
+    ``a.jpg``) dilaporkan gagal alih-alih menimpa hasil tersebut.
+    """
+    inputs = list(inputs)
+    tasks, clashes, claimed = [], [], {}
+    for i, (path, output) in enumerate(zip(inputs, output_paths(inputs, output_dir))):
+        owner = claimed.setdefault(os.path.normcase(output), i)
+        if owner == i:
+            tasks.append((path, output))
+        else:
+            clashes.append({"path": path, "output": None, "ok": False, "seconds": 0.0,
+                            "error": f"StegoError: file hasil {output} sudah dipakai "
+                                     f"{inputs[owner]}"})
+    for directory in {os.path.dirname(output) for _, output in tasks} | {output_dir}:
+        os.makedirs(directory, exist_ok=True)
+    order = {path: i for i, path in enumerate(inputs)}
+    options = {"legacy": legacy, "bits_per_channel": bits_per_channel, "alpha": alpha,
+               "compression": compression, "level": level, "key": key, "ecc": ecc}
+    results = run_chunks(_encode_chunk, _chunks(tasks, chunksize),
+                         (message, options, png_options or {}, profile), workers, max_pending)
+    return sorted([*clashes, *results], key=lambda r: order[r["path"]])
+
+
+def decode_batch(inputs, workers=None, chunksize=1, max_pending=None, profile=False, key=None):
+    """Mengekstrak pesan dari banyak gambar.
+
+    Mengembalikan daftar dict per file (``path``, ``ok``, ``message``,
+    ``error``, ``seconds``) dengan urutan yang sama seperti ``inputs``.
+    Dengan ``profile=True`` tiap hasil juga memuat ``metrics`` per tahap.
+    ``key`` dipakai untuk gambar yang disisipi dalam mode berkunci.
+    """
+    inputs = list(inputs)
+    order = {path: i for i, path in enumerate(inputs)}
+    results = run_chunks(_decode_chunk, _chunks(inputs, chunksize), (profile, key), workers,
+                         max_pending)
+    return sorted(results, key=lambda r: order[r["path"]])
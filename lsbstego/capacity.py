@@ -0,0 +1,119 @@
+"""Perkiraan kapasitas sebelum encode, cukup dari header gambar.
+
+``Image.open`` di Pillow hanya membaca header file (dimensi dan mode), jadi
+kapasitas setiap mode penyisipan bisa dihitung, dan pesan yang terlalu
+besar bisa ditolak atau dialihkan sebelum piksel di-decode. Ukuran payload
+per codec kompresi hanya bergantung pada pesan, jadi cukup dihitung sekali
+(:func:`payload_sizes`) untuk banyak gambar.
+"""
+
+from PIL import Image
+
+from .codec import payload_bits
+from .compression import available_codecs
+from .ecc import encoded_bits
+from .payload import HEADER_SIZE, LEGACY_DELIMITER, build_payload, capacity_bits
+
+# Mode penyisipan yang dilaporkan: (nama, bit per channel, alpha, legacy)
+MODES = [("legacy", 1, False, True)] + [
+    (f"{k}bit" + ("+alpha" if alpha else ""), k, alpha, False)
+    for alpha in (False, True) for k in (1, 2, 3, 4)
+]
+
+
+def image_info(image_path):
+    """Dimensi, mode, dan format gambar tanpa men-decode piksel."""
+    with Image.open(image_path) as img:
+        return {"width": img.width, "height": img.height, "mode": img.mode,
+                "format": img.format}
+
+
+def max_message_bytes(width, height, bits_per_channel=1, alpha=False, legacy=False):
+    """Panjang data maksimum (byte, setelah kompresi) yang masih muat.
+
+    Untuk format lama hasilnya jumlah karakter Latin-1 setelah dikurangi
+    delimiter ``#####``; untuk format berheader, setelah dikurangi header.
+    ``None`` berarti gambar terlalu kecil bahkan untuk header/delimiter saja.
+    """
+    bits = capacity_bits(width, height, bits_per_channel, alpha)
+    overhead = len(LEGACY_DELIMITER) if legacy else HEADER_SIZE
+    available = bits // 8 - overhead
+    return available if available >= 0 else None
+
+
+def payload_size(secret_message, legacy=False, compression=None, level=None, ecc=None):
+    """Jumlah bit yang akan disisipkan untuk pesan ini (termasuk header atau delimiter)."""
+    if legacy:
+        return len(payload_bits(secret_message, legacy=True))
+    nbits = len(build_payload(secret_message, compression=compression, level=level)) * 8
+    if ecc:
+        return (encoded_bits(HEADER_SIZE * 8, ecc)
+                + encoded_bits(nbits - HEADER_SIZE * 8, ecc))
+    return nbits
+
+
+def payload_sizes(secret_message, codecs=None, level=None, ecc=None):
+    """Ukuran payload (bit) tanpa kompresi (``"none"``), per codec, dan format lama.
+
+    ``"legacy"`` bernilai ``None`` jika pesan tidak bisa ditulis dengan
+    format lama (data biner, atau ``ecc`` diisi). ``ecc`` berlaku untuk
+    semua ukuran lainnya.
+    """
+    codecs = available_codecs() if codecs is None else codecs
+    sizes = {"legacy": payload_size(secret_message, legacy=True)
+             if isinstance(secret_message, str) and not ecc else None}
+    sizes["none"] = payload_size(secret_message, ecc=ecc)
+    for codec in codecs:
+        sizes[codec] = payload_size(secret_message, compression=codec, level=level, ecc=ecc)
+    return sizes
+
+
+def capacity_report(image_path, sizes=None, ecc=None):
+    """Kapasitas gambar untuk setiap mode dan, jika ``sizes`` diberikan, apakah pesan muat.
+
+    ``sizes`` adalah hasil :func:`payload_sizes`. Setiap mode berisi
+    ``capacity_bits``, ``max_bytes`` (None jika gambar terlalu kecil untuk
+    payload apa pun; ``fits`` mode itu tidak pernah True), dan ``fits`` (codec -> bool; mode
+    ``legacy`` hanya dibandingkan dengan ukuran format lama). ``ecc`` harus
+    sama dengan yang dipakai untuk ``sizes``: mode yang tidak mendukung ECC
+    (format lama, 2-4 bit, alpha) mendapat ``fits`` bernilai None.
+    """
+    info = image_info(image_path)
+    modes = []
+    for name, bits_per_channel, alpha, legacy in MODES:
+        bits = capacity_bits(info["width"], info["height"], bits_per_channel, alpha)
+        mode = {"name": name, "bits_per_channel": bits_per_channel, "alpha": alpha,
+                "legacy": legacy, "capacity_bits": bits,
+                "max_bytes": max_message_bytes(info["width"], info["height"],
+                                               bits_per_channel, alpha, legacy)}
+        if sizes is not None:
+            if legacy:
+                needed = {"none": sizes["legacy"]} if sizes["legacy"] is not None else {}
+            else:
+                needed = {codec: size for codec, size in sizes.items() if codec != "legacy"}
+            supported = not (ecc and (legacy or bits_per_channel > 1 or alpha))
+            mode["fits"] = {codec: size <= bits if supported else None
+                            for codec, size in needed.items()}
+        modes.append(mode)
+    return dict(info, path=image_path, modes=modes)
+
+
+def preflight(image_path, secret_message, legacy=False, bits_per_channel=1, alpha=False,
+              compression=None, level=None, ecc=None):
+    """Cek satu konfigurasi encode tanpa decode piksel.
+
+    Mengembalikan dict berisi info gambar, ``capacity_bits``,
+    ``needed_bits``, dan ``fits``; ``encode_image`` dengan argumen yang sama
+    gagal dengan :class:`~lsbstego.errors.MessageTooLargeError` tepat ketika
+    ``fits`` bernilai False. Kombinasi yang ditolak ``encode_image``
+    (mis. ``ecc`` pada mode 2-4 bit/alpha) memunculkan ``ValueError`` yang sama.
+    """
+    if legacy and (bits_per_channel > 1 or alpha):
+        raise ValueError("Format lama hanya mendukung 1 bit per channel RGB.")
+    if ecc and (legacy or bits_per_channel > 1 or alpha):
+        raise ValueError("ECC hanya didukung pada mode default 1 bit per channel RGB tanpa kunci.")
+    info = image_info(image_path)
+    capacity = capacity_bits(info["width"], info["height"], bits_per_channel, alpha)
+    needed = payload_size(secret_message, legacy, compression, level, ecc)
+    return dict(info, path=image_path, capacity_bits=capacity, needed_bits=needed,
+                fits=needed <= capacity)
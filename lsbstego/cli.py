@@ -0,0 +1,449 @@
+"""Antarmuka baris perintah: ``python -m lsbstego encode|decode``."""
+
+import argparse
+import asyncio
+import base64
+import json
+import sys
+import time
+
+from .batch import collect_inputs, decode_batch, encode_batch
+from .capacity import capacity_report, payload_sizes
+from .codec import encode_image
+from .compression import available_codecs
+from .detect import MAX_PIXELS, rank, scan_images
+from .ecc import ECC_IDS
+from .errors import StegoError
+from .frames import decode_file, decode_frames, encode_frames, frame_format
+from .pngout import FILTERS, STRATEGIES, save_image
+from .profiling import Metrics
+from .rawmap import decode_mapped, encode_mapped
+from .server import MAX_BODY_BYTES, serve
+from .stream import decode_stream, encode_stream
+
+
+def build_parser():
+    """Menyusun parser argumen untuk semua subperintah."""
+    parser = argparse.ArgumentParser(
+        prog="lsbstego",
+        description="Menyembunyikan dan mengekstrak pesan rahasia dalam gambar (LSB).",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    enc = sub.add_parser("encode", help="sisipkan pesan ke dalam gambar")
+    enc.add_argument("input", help="gambar sumber")
+    enc.add_argument("-o", "--output", required=True, help="file hasil (disarankan PNG)")
+    source = enc.add_mutually_exclusive_group(required=True)
+    source.add_argument("-m", "--message", help="pesan rahasia")
+    source.add_argument("-f", "--message-file", help="baca pesan dari file teks ('-' untuk stdin)")
+    add_layout_options(enc)
+    add_key_option(enc)
+    add_stream_options(enc)
+    add_png_options(enc)
+    add_profile_option(enc)
+    enc.set_defaults(func=cmd_encode)
+
+    dec = sub.add_parser("decode", help="ekstrak pesan dari gambar")
+    dec.add_argument("input", help="gambar yang mengandung pesan")
+    dec.add_argument("-o", "--output", help="tulis pesan ke file alih-alih stdout")
+    add_key_option(dec)
+    add_stream_options(dec)
+    add_profile_option(dec)
+    dec.set_defaults(func=cmd_decode)
+
+    benc = sub.add_parser("batch-encode", help="sisipkan pesan yang sama ke banyak gambar")
+    benc.add_argument("source", help="direktori, pola glob (mis. 'img/*.png'), atau file manifest")
+    benc.add_argument("-o", "--output-dir", required=True, help="direktori hasil")
+    source = benc.add_mutually_exclusive_group(required=True)
+    source.add_argument("-m", "--message", help="pesan rahasia")
+    source.add_argument("-f", "--message-file", help="baca pesan dari file teks ('-' untuk stdin)")
+    add_layout_options(benc)
+    add_key_option(benc)
+    add_png_options(benc)
+    add_batch_options(benc)
+    add_profile_option(benc)
+    benc.set_defaults(func=cmd_batch_encode)
+
+    bdec = sub.add_parser("batch-decode", help="ekstrak pesan dari banyak gambar")
+    bdec.add_argument("source", help="direktori, pola glob, atau file manifest")
+    add_key_option(bdec)
+    add_batch_options(bdec)
+    add_profile_option(bdec)
+    bdec.set_defaults(func=cmd_batch_decode)
+
+    scan = sub.add_parser("scan", help="saring banyak gambar dengan steganalisis LSB")
+    scan.add_argument("source", help="gambar, direktori, pola glob, atau file manifest")
+    scan.add_argument("--jsonl", metavar="FILE",
+                      help="tulis hasil per gambar sebagai JSON Lines begitu selesai ('-' untuk stdout)")
+    scan.add_argument("--top", type=int, default=50,
+                      help="jumlah gambar skor tertinggi di laporan (default: 50, 0 = semua)")
+    scan.add_argument("--threshold", type=float, default=None,
+                      help="hanya laporkan gambar dengan skor minimal ini (0-1)")
+    scan.add_argument("--max-pixels", type=int, default=MAX_PIXELS,
+                      help=f"batas piksel sampel RS/SPA per gambar (default: {MAX_PIXELS})")
+    add_batch_options(scan, chunksize=8)
+    scan.set_defaults(func=cmd_scan)
+
+    cap = sub.add_parser("capacity", help="hitung kapasitas tiap mode tanpa decode piksel")
+    cap.add_argument("source", help="gambar, direktori, pola glob, atau file manifest")
+    source = cap.add_mutually_exclusive_group()
+    source.add_argument("-m", "--message", help="pesan yang akan dicek muat/tidaknya")
+    source.add_argument("-f", "--message-file", help="baca pesan dari file teks ('-' untuk stdin)")
+    cap.add_argument("--binary", action="store_true",
+                     help="baca --message-file sebagai data biner mentah, bukan teks")
+    cap.add_argument("--compress", nargs="+", choices=available_codecs(), default=None,
+                     help="codec yang dibandingkan (default: semua yang tersedia)")
+    cap.add_argument("--level", type=int, default=None, help="level kompresi payload")
+    cap.add_argument("--ecc", choices=list(ECC_IDS), default=None,
+                     help="hitung ukuran payload dengan koreksi galat")
+    cap.add_argument("--json", action="store_true", help="cetak laporan sebagai JSON")
+    cap.set_defaults(func=cmd_capacity)
+
+    srv = sub.add_parser("serve", help="jalankan layanan HTTP encode/decode (asyncio)")
+    srv.add_argument("--host", default="127.0.0.1", help="alamat TCP (default: 127.0.0.1)")
+    srv.add_argument("--port", type=int, default=8080, help="port TCP (default: 8080)")
+    srv.add_argument("--unix", metavar="PATH", help="dengarkan di Unix socket alih-alih TCP")
+    srv.add_argument("-w", "--workers", type=int, default=None,
+                     help="jumlah proses worker (default: jumlah CPU)")
+    srv.add_argument("--max-in-flight", type=int, default=None,
+                     help="batas request yang diproses sekaligus (default: 2x worker)")
+    srv.add_argument("--max-queue", type=int, default=None,
+                     help="batas request yang menunggu sebelum ditolak 503 (default: 4x in-flight)")
+    srv.add_argument("--max-body", type=int, default=MAX_BODY_BYTES,
+                     help=f"batas ukuran body request dalam byte (default: {MAX_BODY_BYTES})")
+    srv.set_defaults(func=cmd_serve)
+    return parser
+
+
+def raw_shape(value):
+    """Parse ukuran buffer mentah berformat LEBARxTINGGIxCHANNEL (mis. 640x480x3)."""
+    try:
+        width, height, channels = (int(v) for v in value.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("format harus LEBARxTINGGIxCHANNEL, mis. 640x480x3")
+    return (height, width, channels)
+
+
+def add_layout_options(parser):
+    """Opsi format/tata letak payload untuk encode."""
+    parser.add_argument("--legacy", action="store_true",
+                        help="tulis format lama dengan delimiter '#####'")
+    parser.add_argument("--bits", type=int, choices=(1, 2, 3, 4), default=1,
+                        help="jumlah bit per channel yang dipakai (default: 1)")
+    parser.add_argument("--alpha", action="store_true",
+                        help="ikut pakai channel alpha (output RGBA)")
+    parser.add_argument("--compress", choices=available_codecs(), default=None,
+                        help="kompres payload sebelum disisipkan")
+    parser.add_argument("--level", type=int, default=None,
+                        help="level kompresi payload (default tergantung codec)")
+    parser.add_argument("--ecc", choices=list(ECC_IDS), default=None,
+                        help="tambah koreksi galat: hamming (1,75x), rep3 (3x), rep5 (5x)")
+    parser.add_argument("--binary", action="store_true",
+                        help="baca --message-file sebagai data biner mentah, bukan teks")
+
+
+def add_key_option(parser):
+    """Opsi kunci untuk mode sebar berkunci."""
+    parser.add_argument("--key", default=None,
+                        help="sebar bit ke posisi acak berkunci; decode butuh kunci yang sama")
+
+
+def add_stream_options(parser):
+    """Opsi mode streaming per strip baris dan jalur mmap."""
+    parser.add_argument("--mmap", action="store_true",
+                        help="BMP/PPM/PGM/raw: baca/tulis LSB langsung di file lewat mmap "
+                             "(output berformat sama dengan input)")
+    parser.add_argument("--raw", type=raw_shape, metavar="WxHxC",
+                        help="perlakukan input sebagai buffer piksel mentah (menyiratkan --mmap)")
+    parser.add_argument("--raw-offset", type=int, default=0,
+                        help="offset byte awal piksel untuk --raw (default: 0)")
+    parser.add_argument("--stream", action="store_true",
+                        help="proses per strip baris agar memori tetap kecil (output PNG)")
+    parser.add_argument("--strip-rows", type=int, default=None,
+                        help="jumlah baris per strip (default: sekitar 8 MB per strip)")
+    parser.add_argument("--frames", action="store_true",
+                        help="GIF/APNG/TIFF: pakai semua frame dan pertahankan mode palette "
+                             "(otomatis untuk GIF)")
+
+
+def add_png_options(parser):
+    """Opsi PNG output: menukar ukuran file dengan kecepatan simpan."""
+    parser.add_argument("--png-level", type=int, choices=range(10), default=None, metavar="0-9",
+                        help="level deflate PNG output (default: 6)")
+    parser.add_argument("--png-strategy", choices=list(STRATEGIES), default="default",
+                        help="strategi zlib untuk PNG output")
+    parser.add_argument("--png-filter", choices=FILTERS, default=None,
+                        help="filter baris PNG (memakai penulis NumPy, bukan Pillow)")
+    parser.add_argument("--png-optimize", action="store_true",
+                        help="perkecil file semaksimal mungkin (level 9, lebih lambat)")
+    parser.add_argument("--png-threads", type=int, default=1,
+                        help="thread untuk kompresi IDAT paralel (0 = semua CPU, default: 1)")
+
+
+def png_options(args):
+    """Mengumpulkan opsi PNG output dari argumen menjadi kwargs ``save_image``."""
+    return {"compress_level": args.png_level, "strategy": args.png_strategy,
+            "filter_type": args.png_filter, "optimize": args.png_optimize,
+            "threads": args.png_threads}
+
+
+def add_profile_option(parser):
+    """Opsi --profile untuk mencetak waktu per tahap."""
+    parser.add_argument("--profile", action="store_true",
+                        help="cetak waktu per tahap dan penghitung (JSON) ke stderr")
+
+
+def print_profile(metrics):
+    """Menulis ringkasan instrumentasi ke stderr."""
+    if metrics is not None:
+        print(json.dumps(metrics.to_dict(), indent=2), file=sys.stderr)
+
+
+def add_batch_options(parser, chunksize=1):
+    """Opsi bersama untuk subperintah batch."""
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="jumlah proses worker (default: jumlah CPU)")
+    parser.add_argument("--chunksize", type=int, default=chunksize,
+                        help=f"jumlah gambar per tugas worker (default: {chunksize})")
+    parser.add_argument("--max-pending", type=int, default=None,
+                        help="batas tugas yang antre sekaligus (default: 2x worker)")
+    parser.add_argument("--json", action="store_true", help="cetak hasil per file sebagai JSON")
+
+
+def read_message(args):
+    """Mengambil pesan dari argumen, file, atau stdin (bytes jika ``--binary``)."""
+    if args.message is not None:
+        return args.message
+    if args.message_file == "-":
+        return sys.stdin.buffer.read() if args.binary else sys.stdin.read()
+    if args.binary:
+        with open(args.message_file, "rb") as f:
+            return f.read()
+    with open(args.message_file, encoding="utf-8") as f:
+        return f.read()
+
+
+def write_message(message, output=None):
+    """Menulis hasil decode ke file atau stdout; data biner ditulis apa adanya."""
+    if isinstance(message, bytes):
+        if output:
+            with open(output, "wb") as f:
+                f.write(message)
+        else:
+            sys.stdout.buffer.write(message)
+            sys.stdout.flush()
+    elif output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(message)
+    else:
+        print(message)
+
+
+def cmd_encode(args):
+    """Subperintah encode."""
+    layout = {"bits_per_channel": args.bits, "alpha": args.alpha}
+    packing = {"compression": args.compress, "level": args.level}
+    metrics = Metrics() if args.profile else None
+    if (args.mmap or args.raw or args.stream) and (args.bits > 1 or args.alpha):
+        raise StegoError("--bits/--alpha hanya didukung pada mode encode biasa.")
+    if args.stream and args.key is not None:
+        raise StegoError("--key butuh akses acak ke piksel; gunakan mode biasa atau --mmap.")
+    if args.frames or frame_format(args.output) == "GIF":
+        if args.legacy or args.bits > 1 or args.alpha or args.key is not None or args.ecc:
+            raise StegoError("--frames tidak mendukung --legacy, --bits, --alpha, --key, "
+                             "atau --ecc.")
+        encode_frames(args.input, args.output, read_message(args), metrics=metrics, **packing)
+    elif args.mmap or args.raw:
+        encode_mapped(args.input, read_message(args), args.output, legacy=args.legacy,
+                      raw_shape=args.raw, raw_offset=args.raw_offset, metrics=metrics,
+                      key=args.key, ecc=args.ecc, **packing)
+    elif args.stream:
+        encode_stream(args.input, args.output, read_message(args), legacy=args.legacy,
+                      rows=args.strip_rows, metrics=metrics, ecc=args.ecc, **packing,
+                      **png_options(args))
+    else:
+        img = encode_image(args.input, read_message(args), legacy=args.legacy,
+                           metrics=metrics, key=args.key, ecc=args.ecc, **layout, **packing)
+        save_image(img, args.output, metrics=metrics, **png_options(args))
+    print(f"Pesan berhasil disembunyikan: {args.output}")
+    print_profile(metrics)
+    return 0
+
+
+def cmd_decode(args):
+    """Subperintah decode."""
+    metrics = Metrics() if args.profile else None
+    if args.stream and args.key is not None:
+        raise StegoError("--key butuh akses acak ke piksel; gunakan mode biasa atau --mmap.")
+    try:
+        if args.frames:
+            if args.key is not None:
+                raise StegoError("--frames tidak mendukung --key.")
+            message = decode_frames(args.input, metrics=metrics)
+        elif args.mmap or args.raw:
+            message = decode_mapped(args.input, raw_shape=args.raw, raw_offset=args.raw_offset,
+                                    metrics=metrics, key=args.key)
+        elif args.stream:
+            message = decode_stream(args.input, rows=args.strip_rows, metrics=metrics)
+        else:
+            message = decode_file(args.input, metrics=metrics, key=args.key)
+    finally:
+        # Tetap dicetak saat tidak ada pesan, agar terlihat berapa piksel yang dibaca
+        print_profile(metrics)
+    write_message(message, args.output)
+    return 0
+
+
+def report_batch(results, elapsed, as_json):
+    """Mencetak hasil batch dan mengembalikan kode keluar."""
+    failed = sum(1 for r in results if not r["ok"])
+    if as_json:
+        # Payload biner ditulis sebagai base64 agar tetap berupa JSON valid
+        print(json.dumps({"elapsed": elapsed, "failed": failed, "results": results},
+                         ensure_ascii=False, indent=2,
+                         default=lambda o: base64.b64encode(o).decode("ascii")))
+    else:
+        for r in results:
+            status = "OK " if r["ok"] else "ERR"
+            detail = (r.get("output") or r.get("message")) if r["ok"] else r["error"]
+            if isinstance(detail, bytes):
+                detail = f"<data biner {len(detail)} byte>"
+            print(f"{status} {r['seconds']:.3f}s {r['path']}: {detail}")
+        print(f"{len(results) - failed}/{len(results)} berhasil dalam {elapsed:.2f}s")
+    return 1 if failed else 0
+
+
+def cmd_batch_encode(args):
+    """Subperintah batch-encode."""
+    start = time.perf_counter()
+    results = encode_batch(collect_inputs(args.source), read_message(args), args.output_dir,
+                           workers=args.workers, chunksize=args.chunksize,
+                           max_pending=args.max_pending, legacy=args.legacy,
+                           bits_per_channel=args.bits, alpha=args.alpha,
+                           compression=args.compress, level=args.level, profile=args.profile,
+                           png_options=png_options(args), key=args.key, ecc=args.ecc)
+    return report_batch(results, time.perf_counter() - start, args.json)
+
+
+def cmd_batch_decode(args):
+    """Subperintah batch-decode."""
+    start = time.perf_counter()
+    results = decode_batch(collect_inputs(args.source), workers=args.workers,
+                           chunksize=args.chunksize, max_pending=args.max_pending,
+                           profile=args.profile, key=args.key)
+    return report_batch(results, time.perf_counter() - start, args.json)
+
+
+def cmd_scan(args):
+    """Subperintah scan."""
+    start = time.perf_counter()
+    stream = None
+    if args.jsonl:
+        stream = sys.stdout if args.jsonl == "-" else open(args.jsonl, "w", encoding="utf-8")
+    counts = {"scanned": 0, "failed": 0}
+
+    def results():
+        for r in scan_images(collect_inputs(args.source), workers=args.workers,
+                             chunksize=args.chunksize, max_pending=args.max_pending,
+                             max_pixels=args.max_pixels):
+            counts["scanned"] += 1
+            counts["failed"] += not r["ok"]
+            if stream:
+                stream.write(json.dumps(r, ensure_ascii=False) + "\n")
+            if r["ok"] and (args.threshold is None or r["score"] >= args.threshold):
+                yield r
+
+    try:
+        ranked = rank(results(), args.top or None)
+    finally:
+        if stream and stream is not sys.stdout:
+            stream.close()
+    elapsed = time.perf_counter() - start
+    if args.jsonl == "-":
+        # stdout sudah dipakai JSON Lines; ringkasan ke stderr
+        print(f"{counts['scanned']} gambar dipindai dalam {elapsed:.2f}s "
+              f"({counts['failed']} gagal)", file=sys.stderr)
+    elif args.json:
+        print(json.dumps(dict(counts, elapsed=elapsed, results=ranked), ensure_ascii=False,
+                         indent=2))
+    else:
+        for r in ranked:
+            sig = f" [{r['signature']}]" if r["signature"] else ""
+            print(f"{r['score']:.3f} chi {r['chi_square']:.3f} rs {fmt_estimate(r['rs'])} "
+                  f"spa {fmt_estimate(r['spa'])} {r['path']}{sig}")
+        print(f"{counts['scanned']} gambar dipindai dalam {elapsed:.2f}s "
+              f"({counts['failed']} gagal)")
+    return 1 if counts["failed"] else 0
+
+
+def fmt_estimate(value):
+    """Format perkiraan RS/SPA yang bisa None."""
+    return "  -  " if value is None else f"{value:.3f}"
+
+
+def print_capacity(report, sizes):
+    """Mencetak tabel kapasitas satu gambar."""
+    print(f"{report['path']}: {report['width']}x{report['height']} {report['mode']} "
+          f"({report['format']})")
+    codecs = [c for c in sizes if c != "legacy"] if sizes else []
+    print(f"  {'mode':<12} {'kapasitas':>14}" + "".join(f" {c:>6}" for c in codecs))
+    for mode in report["modes"]:
+        if mode["max_bytes"] is None:
+            line = f"  {mode['name']:<12} {'terlalu kecil':>14}"
+        else:
+            line = f"  {mode['name']:<12} {mode['max_bytes']:>12} B"
+        for codec in codecs:
+            if mode["legacy"] and codec != "none":
+                mark = "-"
+            else:
+                fits = mode["fits"].get("none" if mode["legacy"] else codec)
+                mark = "-" if fits is None else "ok" if fits else "x"
+            line += f" {mark:>6}"
+        print(line)
+
+
+def cmd_capacity(args):
+    """Subperintah capacity."""
+    sizes = None
+    if args.message is not None or args.message_file is not None:
+        sizes = payload_sizes(read_message(args), args.compress, args.level, args.ecc)
+    reports = [capacity_report(path, sizes, args.ecc) for path in collect_inputs(args.source)]
+    if args.json:
+        print(json.dumps({"payload_bits": sizes, "images": reports}, indent=2))
+        return 0
+    if sizes:
+        print("payload: " + ", ".join(f"{codec} {(bits + 7) // 8} B"
+                                      for codec, bits in sizes.items() if bits is not None))
+    for report in reports:
+        print_capacity(report, sizes)
+    return 0
+
+
+def cmd_serve(args):
+    """Subperintah serve."""
+    def ready(addresses):
+        for address in addresses:
+            where = address if isinstance(address, str) else f"http://{address[0]}:{address[1]}"
+            print(f"Melayani di {where} (Ctrl+C untuk berhenti)", file=sys.stderr)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, ready=ready, workers=args.workers,
+                          max_in_flight=args.max_in_flight, max_queue=args.max_queue,
+                          max_body=args.max_body))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def main(argv=None):
+    """Menjalankan CLI dan mengembalikan kode keluar."""
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except FileNotFoundError as e:
+        print(f"Error: file tidak ditemukan: {e.filename}", file=sys.stderr)
+    except StegoError as e:
+        print(f"Error: {e}", file=sys.stderr)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+    return 1
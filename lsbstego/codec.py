@@ -0,0 +1,405 @@
+"""Encoder dan decoder LSB berbasis array NumPy."""
+
+import numpy as np
+from PIL import Image
+
+from .ecc import ECC_IDS, decode_bits, encode_bits, encoded_bits
+from .errors import MessageTooLargeError, NoMessageError, PayloadError
+from .payload import (FLAG_ECC_MASK, HEADER_PIXELS, HEADER_SIZE, LAYOUT_FLAGS,
+                      LEGACY_DELIMITER, build_payload, capacity_bits, ecc_flags, header_ecc,
+                      header_layout, layout_flags, looks_like_legacy, message_to_bits,
+                      parse_header, unpack_payload)
+from .profiling import NULL_METRICS
+from .scatter import decode_scattered, embed_scattered
+
+# Byte LSB terbanyak yang dibaca untuk mencoba header ber-ECC
+ECC_HEADER_BYTES = max(-(-encoded_bits(HEADER_SIZE * 8, scheme) // 8) for scheme in ECC_IDS)
+
+
+def embed_bits(channels, bits, bits_per_channel=1):
+    """Menulis bit ke LSB dari array channel datar secara massal (in-place).
+
+    Dengan ``bits_per_channel`` = k > 1, setiap k bit digabung menjadi satu
+    nilai lalu ditulis ke k bit terbawah tiap channel dalam satu operasi mask.
+    """
+    k = bits_per_channel
+    if k > 1:
+        pad = -len(bits) % k
+        if pad:
+            bits = np.concatenate((bits, np.zeros(pad, dtype=np.uint8)))
+        bits = np.packbits(bits.reshape(-1, k), axis=1).ravel() >> (8 - k)
+    n = len(bits)
+    target = channels[:n]
+    np.bitwise_and(target, 0xFF ^ ((1 << k) - 1), out=target)
+    np.bitwise_or(target, bits, out=target)
+    return channels
+
+
+def extract_bits(channels, bits_per_channel=1):
+    """Kebalikan :func:`embed_bits`: mengambil k bit terbawah tiap channel sebagai aliran bit."""
+    k = bits_per_channel
+    values = np.bitwise_and(channels, (1 << k) - 1)
+    if k == 1:
+        return values
+    return np.unpackbits(values.reshape(-1, 1), axis=1)[:, 8 - k:].ravel()
+
+
+def read_lsb_bytes(pixels, nbytes):
+    """Membaca ``nbytes`` byte pertama dari bidang LSB, hanya dari baris yang diperlukan."""
+    nbits = nbytes * 8
+    row_channels = max(1, pixels[0].size if pixels.shape[0] else 1)
+    rows = -(-nbits // row_channels)
+    bits = np.bitwise_and(pixels[:rows], 1).reshape(-1)[:nbits]
+    return np.packbits(bits).tobytes()
+
+
+def iter_lsb_bytes(pixels, first_channels=4096, max_channels=1 << 22):
+    """Mengekstrak LSB per blok baris dan menghasilkan byte yang sudah di-pack.
+
+    Ukuran blok dimulai kecil lalu digandakan, sehingga pesan pendek cukup
+    membaca beberapa baris pertama, sedangkan gambar tanpa pesan tetap
+    diproses dalam sedikit operasi vektor.
+    """
+    height = pixels.shape[0]
+    row_channels = max(1, pixels[0].size if height else 1)
+    pending = np.empty(0, dtype=np.uint8)
+    block_channels = first_channels
+    y = 0
+    while y < height:
+        rows = max(1, block_channels // row_channels)
+        block = pixels[y:y + rows]
+        y += rows
+        bits = np.bitwise_and(block, 1).reshape(-1)
+        if len(pending):
+            bits = np.concatenate((pending, bits))
+        usable = len(bits) - len(bits) % 8
+        pending = bits[usable:]
+        yield np.packbits(bits[:usable]).tobytes()
+        block_channels = min(block_channels * 2, max_channels)
+
+
+def payload_bits(secret_message, legacy=False, flags=0, compression=None, level=None, ecc=None):
+    """Menyusun bit yang akan disisipkan untuk sebuah pesan.
+
+    Dengan ``ecc`` (lihat :mod:`lsbstego.ecc`), header dan isi payload
+    di-encode terpisah agar decoder bisa membaca header sebelum tahu panjang isi.
+    """
+    if legacy:
+        if not isinstance(secret_message, str) or compression or ecc:
+            raise ValueError("Format lama hanya mendukung pesan teks tanpa kompresi/ECC.")
+        return message_to_bits(secret_message + "#####")
+    payload = build_payload(secret_message, flags | ecc_flags(ecc), compression, level)
+    bits = np.unpackbits(np.frombuffer(payload, dtype=np.uint8))
+    if ecc:
+        split = HEADER_SIZE * 8
+        bits = np.concatenate((encode_bits(bits[:split], ecc), encode_bits(bits[split:], ecc)))
+    return bits
+
+
+def _layout_bits(secret_message, legacy, bits_per_channel, alpha, compression, level, metrics,
+                 key=None, ecc=None):
+    flags = layout_flags(bits_per_channel, alpha)
+    if legacy and flags:
+        raise ValueError("Format lama hanya mendukung 1 bit per channel RGB.")
+    if key is not None and (legacy or flags):
+        raise ValueError("Mode berkunci hanya mendukung format berheader 1 bit per channel RGB.")
+    if ecc and (flags or key is not None):
+        raise ValueError("ECC hanya didukung pada mode default 1 bit per channel RGB tanpa kunci.")
+    with metrics.stage("payload"):
+        bits = payload_bits(secret_message, legacy, flags, compression, level, ecc)
+    metrics.add("payload_bits", len(bits))
+    metrics.add("bytes_allocated", bits.nbytes)
+    return bits
+
+
+def _embed_layout(pixels, bits, bits_per_channel, alpha, metrics, key=None):
+    if key is not None:
+        with metrics.stage("embed"):
+            embed_scattered(pixels, bits, key)
+        metrics.add("pixels_touched", len(bits))
+        return pixels
+    if bits_per_channel == 1 and not alpha:
+        with metrics.stage("embed"):
+            embed_bits(pixels.reshape(-1), bits)
+        metrics.add("pixels_touched", -(-len(bits) // pixels.shape[2]))
+        return pixels
+
+    channels = 4 if alpha else 3
+    flat = pixels.reshape(-1, channels)
+    header_bits, body_bits = bits[:HEADER_SIZE * 8], bits[HEADER_SIZE * 8:]
+    with metrics.stage("embed"):
+        head = flat[:HEADER_PIXELS, :3].copy()
+        embed_bits(head.reshape(-1), header_bits)
+        flat[:HEADER_PIXELS, :3] = head
+        embed_bits(flat[HEADER_PIXELS:].reshape(-1), body_bits, bits_per_channel)
+    metrics.add("pixels_touched",
+                HEADER_PIXELS + -(-len(body_bits) // (channels * bits_per_channel)))
+    return pixels
+
+
+def encode_pixels(pixels, secret_message, legacy=False, bits_per_channel=1, alpha=False,
+                  compression=None, level=None, metrics=None, key=None, ecc=None):
+    """Menyisipkan pesan ke array piksel (H, W, 3), atau (H, W, 4) jika ``alpha``, in-place.
+
+    Mode default (1 bit, RGB) menulis header dan isi berurutan di LSB channel
+    RGB. Mode lain menulis header di LSB RGB piksel-piksel pertama, lalu isi
+    payload mulai piksel berikutnya dengan k bit per channel (RGB atau RGBA).
+    Dengan ``key``, header dan isi disebar ke channel RGB menurut permutasi
+    berkunci (lihat :mod:`lsbstego.scatter`).
+    """
+    metrics = metrics or NULL_METRICS
+    bits = _layout_bits(secret_message, legacy, bits_per_channel, alpha, compression, level,
+                        metrics, key, ecc)
+    height, width = pixels.shape[:2]
+    if len(bits) > capacity_bits(width, height, bits_per_channel, alpha):
+        raise MessageTooLargeError("Ukuran pesan terlalu besar untuk gambar ini!")
+    return _embed_layout(pixels, bits, bits_per_channel, alpha, metrics, key)
+
+
+def encode_image(image_path, secret_message, legacy=False, bits_per_channel=1, alpha=False,
+                 compression=None, level=None, metrics=None, key=None, ecc=None):
+    """Menyisipkan pesan rahasia ke dalam gambar dan mengembalikan Image baru.
+
+    Secara default pesan ditulis dengan header berpanjang tetap; ``legacy=True``
+    menulis format lama yang diakhiri delimiter "#####". ``bits_per_channel``
+    (1-4) dan ``alpha`` menambah kapasitas, ``compression``/``level``
+    mengompres payload; semuanya tercatat di header sehingga decoder
+    mendeteksinya otomatis. Pesan boleh berupa ``str`` atau ``bytes``.
+    ``key`` (``str``/``bytes``) menyebar bit ke posisi acak berkunci; pesan
+    hanya bisa dibaca kembali dengan kunci yang sama. ``ecc`` (``"hamming"``,
+    ``"rep3"``, ``"rep5"``) menambah kode koreksi galat agar LSB yang
+    terbalik tetap bisa dipulihkan.
+    ``metrics`` (opsional, :class:`~lsbstego.profiling.Metrics`) mencatat
+    waktu tiap tahap.
+    """
+    metrics = metrics or NULL_METRICS
+    mode = "RGBA" if alpha else "RGB"
+    with metrics.stage("open"):
+        img = Image.open(image_path, 'r')
+    bits = _layout_bits(secret_message, legacy, bits_per_channel, alpha, compression, level,
+                        metrics, key, ecc)
+    # Kapasitas cukup dihitung dari header file, sebelum piksel di-decode
+    if len(bits) > capacity_bits(img.width, img.height, bits_per_channel, alpha):
+        img.close()
+        raise MessageTooLargeError("Ukuran pesan terlalu besar untuk gambar ini!")
+    with metrics.stage("load"):
+        img.load()
+    with metrics.stage("convert"):
+        img = img.convert(mode)
+    with metrics.stage("copy"):
+        pixels = np.array(img, dtype=np.uint8)
+    metrics.add("bytes_allocated", 2 * pixels.nbytes)
+    _embed_layout(pixels, bits, bits_per_channel, alpha, metrics, key)
+    with metrics.stage("to_image"):
+        return Image.fromarray(pixels, mode)
+
+
+def load_pixels(image_path, metrics=None):
+    """Membuka gambar dan mengembalikan array RGB, atau RGBA jika gambar punya alpha."""
+    metrics = metrics or NULL_METRICS
+    with metrics.stage("open"):
+        img = Image.open(image_path, 'r')
+    with metrics.stage("load"):
+        img.load()
+    if img.mode not in ("RGB", "RGBA"):
+        with metrics.stage("convert"):
+            img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+        metrics.add("bytes_allocated", img.width * img.height * len(img.getbands()))
+    with metrics.stage("to_array"):
+        return np.asarray(img)
+
+
+def count_lsb_read(metrics, nbytes):
+    """Mencatat byte LSB (aliran 1-bit RGB) yang dibaca dan jumlah piksel yang memuatnya."""
+    metrics.add("lsb_bytes_needed", nbytes)
+    metrics.add("pixels_read", -(-nbytes * 8 // 3))
+
+
+def scan_legacy(data, chunks, metrics=None):
+    """Mencari delimiter "#####" di ``data`` lalu di potongan byte berikutnya (format lama)."""
+    metrics = metrics or NULL_METRICS
+    end = data.find(LEGACY_DELIMITER)
+    if end == -1:
+        for chunk in chunks:
+            # Cukup cari mulai dari akhir data sebelumnya agar tidak memindai ulang
+            start = max(0, len(data) - len(LEGACY_DELIMITER) + 1)
+            data += chunk
+            end = data.find(LEGACY_DELIMITER, start)
+            if end != -1:
+                break
+        else:
+            count_lsb_read(metrics, len(data))
+            raise NoMessageError()
+    count_lsb_read(metrics, end + len(LEGACY_DELIMITER))
+    return data[:end].decode('latin-1')
+
+
+def decode_legacy(pixels):
+    """Memindai bidang LSB sampai delimiter "#####" (format lama)."""
+    return scan_legacy(bytearray(), iter_lsb_bytes(pixels))
+
+
+def read_layout_payload(pixels, header, metrics=None):
+    """Membaca isi payload mode k-bit/alpha, hanya dari baris yang memuatnya."""
+    bits_per_channel, alpha = header_layout(header)
+    channels = 4 if alpha else 3
+    if pixels.shape[2] < channels:
+        raise PayloadError("Payload memakai channel alpha, tetapi gambar tidak memiliki alpha.")
+    height, width = pixels.shape[:2]
+    nbits = header["length"] * 8
+    start = HEADER_PIXELS
+    end = start + -(-nbits // (channels * bits_per_channel))
+    if end > height * width:
+        raise PayloadError("Panjang payload pada header melebihi kapasitas gambar.")
+    first_row, last_row = start // width, -(-end // width)
+    block = pixels[first_row:last_row, :, :channels].reshape(-1, channels)
+    block = block[start - first_row * width:end - first_row * width]
+    bits = extract_bits(block.reshape(-1), bits_per_channel)[:nbits]
+    (metrics or NULL_METRICS).add("pixels_read", end)
+    return np.packbits(bits).tobytes()
+
+
+def _fill(data, chunks, nbytes):
+    """Menambahkan potongan dari ``chunks`` ke ``data`` sampai panjangnya ``nbytes``."""
+    while len(data) < nbytes:
+        chunk = next(chunks, None)
+        if chunk is None:
+            return False
+        data += chunk
+    return True
+
+
+def find_ecc_header(data, chunks):
+    """Mencoba men-decode header ber-ECC di awal ``data`` dengan tiap skema.
+
+    Mengembalikan (header, jumlah bit header ter-encode, bit yang diperbaiki),
+    atau None jika tidak ada skema yang menghasilkan header valid. Hanya
+    beberapa puluh byte pertama yang dibaca.
+    """
+    for scheme in ECC_IDS:
+        nbits = encoded_bits(HEADER_SIZE * 8, scheme)
+        nbytes = -(-nbits // 8)
+        if not _fill(data, chunks, nbytes):
+            break
+        coded = np.unpackbits(np.frombuffer(bytes(data[:nbytes]), dtype=np.uint8))
+        bits, corrected = decode_bits(coded, HEADER_SIZE * 8, scheme)
+        try:
+            header = parse_header(np.packbits(bits).tobytes())
+        except PayloadError:
+            continue
+        if header is not None and header_ecc(header) == scheme:
+            return header, nbits, corrected
+    return None
+
+
+def decode_ecc(header, header_bits, data, chunks, capacity, metrics=None):
+    """Membaca dan memperbaiki isi payload ber-ECC yang dimulai setelah ``header_bits`` bit."""
+    metrics = metrics or NULL_METRICS
+    scheme = header_ecc(header)
+    if header["flags"] & LAYOUT_FLAGS:
+        raise PayloadError("ECC tidak didukung pada mode k-bit/alpha.")
+    nbits = header["length"] * 8
+    total_bits = header_bits + encoded_bits(nbits, scheme)
+    total = -(-total_bits // 8)
+    if total > capacity:
+        raise PayloadError("Panjang payload pada header melebihi kapasitas gambar.")
+    if not _fill(data, chunks, total):
+        raise PayloadError("Payload terpotong sebelum mencapai panjang pada header.")
+    coded = np.unpackbits(np.frombuffer(bytes(data[:total]), dtype=np.uint8))
+    with metrics.stage("ecc"):
+        bits, corrected = decode_bits(coded[header_bits:total_bits], nbits, scheme)
+    metrics.add("ecc_corrected", corrected)
+    count_lsb_read(metrics, total)
+    with metrics.stage("unpack"):
+        return unpack_payload(header, np.packbits(bits).tobytes())
+
+
+def decode_chunks(chunks, capacity, read_layout=None, metrics=None):
+    """Mengekstrak pesan dari aliran byte LSB yang sudah di-pack.
+
+    ``chunks`` hanya dikonsumsi sejauh yang dibutuhkan: sampai header +
+    panjang payload untuk format berheader, atau sampai delimiter untuk
+    format lama. ``capacity`` adalah jumlah byte LSB maksimum di gambar.
+    Payload mode k-bit/alpha dibaca lewat ``read_layout(header)``; jika
+    tidak diberikan, mode tersebut ditolak. Dengan ``metrics``, jumlah byte
+    LSB yang benar-benar dibutuhkan dicatat sebagai ``lsb_bytes_needed``
+    dan jumlah piksel yang dibaca sampai payload/delimiter ditemukan sebagai
+    ``pixels_read``. Payload ber-ECC dikenali dari header yang di-decode
+    dengan tiap skema; jumlah bit yang diperbaiki dicatat sebagai
+    ``ecc_corrected``.
+    """
+    metrics = metrics or NULL_METRICS
+    chunks = metrics.timed_iter("extract", iter(chunks))
+    data = bytearray()
+    while len(data) < HEADER_SIZE:
+        chunk = next(chunks, None)
+        if chunk is None:
+            break
+        data += chunk
+    prefix = bytes(data[:HEADER_SIZE])
+    error = None
+    try:
+        header = parse_header(prefix)
+    except PayloadError as e:
+        # Salinan pertama header rep3/rep5 tersimpan mentah: satu bit terbalik
+        # di byte versi belum tentu berarti payload tidak bisa dipulihkan
+        header, error = None, e
+    if header is not None and not header["flags"] & FLAG_ECC_MASK:
+        try:
+            return _decode_plain(header, data, chunks, capacity, read_layout, metrics)
+        except PayloadError as e:
+            # Bit terbalik bisa menghapus flag ECC; coba header ber-ECC dulu
+            error = e
+    if header is None or error is not None or header["flags"] & FLAG_ECC_MASK:
+        # Header rusak bisa jadi masih terbaca lewat ECC sebelum jatuh ke format lama
+        found = find_ecc_header(data, chunks)
+        if found is not None:
+            header, header_bits, corrected = found
+            metrics.add("ecc_corrected", corrected)
+            return decode_ecc(header, header_bits, data, chunks, capacity, metrics)
+        if error is not None:
+            raise error
+        if header is not None:
+            raise PayloadError("Header ECC tidak valid.")
+    if not looks_like_legacy(prefix):
+        count_lsb_read(metrics, min(len(data), ECC_HEADER_BYTES))
+        raise NoMessageError()
+    return scan_legacy(data, chunks, metrics)
+
+
+def _decode_plain(header, data, chunks, capacity, read_layout, metrics):
+    """Membaca payload tanpa ECC setelah header ``header`` yang sudah di-parse."""
+    if header["flags"] & LAYOUT_FLAGS:
+        if read_layout is None:
+            raise PayloadError("Mode k-bit/alpha tidak didukung di jalur ini; gunakan decode_image.")
+        metrics.add("lsb_bytes_needed", HEADER_SIZE + header["length"])
+        data = read_layout(header)
+        with metrics.stage("unpack"):
+            return unpack_payload(header, data)
+    total = HEADER_SIZE + header["length"]
+    if total > capacity:
+        raise PayloadError("Panjang payload pada header melebihi kapasitas gambar.")
+    if not _fill(data, chunks, total):
+        raise PayloadError("Payload terpotong sebelum mencapai panjang pada header.")
+    count_lsb_read(metrics, total)
+    with metrics.stage("unpack"):
+        return unpack_payload(header, bytes(data[HEADER_SIZE:total]))
+
+
+def decode_pixels(pixels, metrics=None, key=None):
+    """Mengekstrak pesan dari array piksel (H, W, 3) atau (H, W, 4)."""
+    rgb = pixels[:, :, :3]
+    if key is not None:
+        return decode_scattered(rgb, key, metrics)
+    return decode_chunks(iter_lsb_bytes(rgb), rgb.size // 8,
+                         lambda header: read_layout_payload(pixels, header, metrics), metrics)
+
+
+def decode_image(image_path, metrics=None, key=None):
+    """Mengekstrak pesan rahasia dari gambar.
+
+    Format dideteksi otomatis: payload berheader dibaca tepat sepanjang
+    header + isi, sedangkan format delimiter lama tetap didukung. Pesan yang
+    disisipkan dengan ``key`` hanya ditemukan jika ``key`` yang sama diberikan.
+    """
+    return decode_pixels(load_pixels(image_path, metrics), metrics, key)
@@ -0,0 +1,57 @@
+"""Tahap kompresi opsional antara pesan dan aliran bit.
+
+Codec ``zlib`` dan ``lzma`` tersedia di pustaka standar; ``zstd`` dipakai
+jika paket ``zstandard`` terpasang.
+"""
+
+import lzma
+import zlib
+
+from .errors import PayloadError
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - dependensi opsional
+    zstandard = None
+
+# Nomor codec yang disimpan di flag header (bit 3-4)
+CODEC_IDS = {"zlib": 1, "lzma": 2, "zstd": 3}
+CODEC_NAMES = {v: k for k, v in CODEC_IDS.items()}
+DEFAULT_LEVELS = {"zlib": 9, "lzma": 6, "zstd": 19}
+
+
+def available_codecs():
+    """Nama codec yang bisa dipakai di lingkungan ini."""
+    return [name for name in CODEC_IDS if name != "zstd" or zstandard is not None]
+
+
+def compress(data, codec, level=None):
+    """Mengompres ``data`` dengan codec dan level yang dipilih."""
+    if codec not in CODEC_IDS:
+        raise ValueError(f"Codec kompresi tidak dikenal: {codec}")
+    if level is None:
+        level = DEFAULT_LEVELS[codec]
+    if codec == "zlib":
+        return zlib.compress(data, level)
+    if codec == "lzma":
+        return lzma.compress(data, preset=level)
+    if zstandard is None:
+        raise ValueError("Kompresi zstd membutuhkan paket 'zstandard'.")
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def decompress(data, codec_id):
+    """Mendekompres payload berdasarkan nomor codec dari header."""
+    codec = CODEC_NAMES.get(codec_id)
+    try:
+        if codec == "zlib":
+            return zlib.decompress(data)
+        if codec == "lzma":
+            return lzma.decompress(data)
+        if codec == "zstd" and zstandard is not None:
+            return zstandard.ZstdDecompressor().decompress(data)
+    except (zlib.error, lzma.LZMAError) as e:
+        raise PayloadError(f"Gagal mendekompres payload: {e}")
+    if codec == "zstd":
+        raise PayloadError("Payload dikompres dengan zstd, tetapi paket 'zstandard' tidak terpasang.")
+    raise PayloadError(f"Codec kompresi pada header tidak dikenal: {codec_id}")
@@ -0,0 +1,24 @@
+"""Exception yang dimunculkan oleh pustaka lsbstego."""
+
+
+class StegoError(Exception):
+    """Kesalahan dasar untuk semua operasi steganografi."""
+
+
+class MessageTooLargeError(StegoError):
+    """Pesan tidak muat di dalam kapasitas gambar."""
+
+
+class NoMessageError(StegoError):
+    """Gambar tidak mengandung pesan tersembunyi yang dikenali."""
+
+    def __init__(self, message="Tidak ada pesan tersembunyi yang ditemukan atau delimiter rusak."):
+        super().__init__(message)
+
+
+class PayloadError(StegoError):
+    """Payload ditemukan tetapi rusak atau formatnya tidak didukung."""
+
+
+class JobCancelled(StegoError):
+    """Pekerjaan dibatalkan oleh pengguna sebelum selesai."""
@@ -0,0 +1,307 @@
+"""Carrier multi-frame: GIF animasi, APNG, dan TIFF multi-halaman.
+
+Payload berheader biasa dipecah menjadi segmen yang mengisi frame satu per
+satu (1 bit per channel). Frame pertama diawali indeks payload
+(``LSBF``, versi, jumlah frame terpakai, panjang segmen tiap frame), sehingga
+decode cukup membaca frame sebanyak yang tercatat lalu berhenti.
+
+Mode warna frame dipertahankan: pada frame palette (``P``) bit ditulis ke
+indeks palette, bukan ke RGB, jadi hasilnya tetap GIF/PNG palette dan tidak
+membengkak menjadi RGB penuh. Piksel dengan indeks transparan (beserta
+pasangannya yang hanya berbeda LSB) dilewati agar transparansi tidak
+berubah. Frame GIF dengan palette berbeda-beda disatukan dulu ke satu
+palette bersama, karena Pillow membuka frame dengan palette lokal sebagai
+RGB dan indeksnya tidak bisa dibaca kembali.
+
+Penyisipan dan ekstraksi per frame berjalan paralel di pool thread (operasi
+NumPy melepas GIL); decode frame oleh Pillow tetap berurutan karena frame
+GIF/APNG bergantung pada frame sebelumnya.
+"""
+
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+from PIL import GifImagePlugin, Image, ImageSequence
+
+from .codec import decode_image, embed_bits
+from .errors import MessageTooLargeError, NoMessageError, PayloadError, StegoError
+from .payload import HEADER_SIZE, build_payload, parse_header, unpack_payload
+from .profiling import NULL_METRICS
+from .rawmap import decode_mapped, is_gray_pnm
+
+INDEX_MAGIC = b"LSBF"
+INDEX_VERSION = 1
+INDEX_FORMAT = ">4sBH"
+INDEX_SIZE = struct.calcsize(INDEX_FORMAT)
+
+FRAME_FORMATS = {".gif": "GIF", ".png": "PNG", ".apng": "PNG", ".tif": "TIFF", ".tiff": "TIFF"}
+CARRIER_MODES = ("P", "L", "RGB", "RGBA")
+LOSSLESS_TIFF = ("raw", "tiff_lzw", "tiff_adobe_deflate", "packbits")
+
+
+def frame_format(path):
+    """Format keluaran multi-frame dari ekstensi file, atau None jika tidak didukung."""
+    return FRAME_FORMATS.get(os.path.splitext(path)[1].lower())
+
+
+@contextmanager
+def _gif_palette_frames():
+    # Default Pillow mengubah semua frame GIF setelah frame pertama menjadi RGB
+    previous = GifImagePlugin.LOADING_STRATEGY
+    GifImagePlugin.LOADING_STRATEGY = GifImagePlugin.LoadingStrategy.RGB_AFTER_DIFFERENT_PALETTE_ONLY
+    try:
+        yield
+    finally:
+        GifImagePlugin.LOADING_STRATEGY = previous
+
+
+def _carrier_mode(frame):
+    if frame.mode in CARRIER_MODES:
+        return frame
+    has_alpha = "A" in frame.getbands() or "transparency" in frame.info
+    return frame.convert("RGBA" if has_alpha else "RGB")
+
+
+def _shared_palette(frames):
+    """Mengkuantisasi semua frame ke satu palette; indeks 255 dipakai untuk transparan."""
+    has_alpha = any("A" in f.getbands() or "transparency" in f.info for f in frames)
+    width, height = frames[0].size
+    sheet = Image.new("RGB", (width, height * len(frames)))
+    for i, frame in enumerate(frames):
+        sheet.paste(frame.convert("RGB"), (0, i * height))
+    palette = sheet.quantize(255 if has_alpha else 256, dither=Image.Dither.NONE)
+    out = []
+    for frame in frames:
+        quantized = frame.convert("RGB").quantize(palette=palette, dither=Image.Dither.NONE)
+        if has_alpha:
+            index = np.array(quantized)
+            index[np.array(frame.convert("RGBA"))[:, :, 3] < 128] = 255
+            quantized = Image.fromarray(index, "P")
+            quantized.putpalette(palette.getpalette())
+            quantized.info["transparency"] = 255
+        quantized.info["duration"] = frame.info.get("duration", 0)
+        out.append(quantized)
+    return out
+
+
+def _normalize_frames(frames, fmt):
+    """Menyamakan mode frame agar penulis ``fmt`` tidak mengubah nilai piksel."""
+    if fmt == "TIFF":
+        # Tiap halaman TIFF ditulis dalam modenya sendiri, tetapi TIFF tidak
+        # menyimpan indeks transparan: tanpa konversi, piksel yang dilewati saat
+        # encode ikut terbaca saat decode dan aliran bit bergeser
+        return [f.convert("RGBA") if "transparency" in f.info else _carrier_mode(f)
+                for f in frames]
+    modes = {f.mode for f in frames}
+    if modes == {"P"} and len({bytes(f.getpalette() or ()) for f in frames}) == 1:
+        return frames
+    if fmt == "GIF":
+        return frames if modes == {"L"} else _shared_palette(frames)
+    if len(modes) == 1 and modes <= {"L", "RGB", "RGBA"}:
+        return frames
+    has_alpha = any("A" in f.getbands() or "transparency" in f.info for f in frames)
+    return [f.convert("RGBA" if has_alpha else "RGB") for f in frames]
+
+
+def _select(arr, transparency):
+    """Bagian array yang memuat bit: channel RGB, atau indeks palette non-transparan."""
+    if arr.ndim == 3:
+        return (slice(None), slice(None), slice(0, 3))
+    if transparency is None:
+        return (slice(None), slice(None))
+    alpha = np.full(256, 255, dtype=np.uint8)
+    if isinstance(transparency, int):
+        alpha[transparency] = 0
+    else:
+        # tRNS PNG palette: alpha per entri palette
+        alpha[:len(transparency)] = np.frombuffer(transparency, dtype=np.uint8)[:256]
+    # Membalik LSB memetakan pasangan {i, i^1} ke dirinya sendiri, jadi mask tetap sama
+    usable = (alpha == 255) & (alpha[np.arange(256) ^ 1] == 255)
+    return usable[arr]
+
+
+def _frame_capacity(arr, select):
+    if isinstance(select, np.ndarray):
+        return int(np.count_nonzero(select)) // 8
+    return arr[select].size // 8
+
+
+def _embed_frame(arr, select, segment):
+    flat = arr[select].reshape(-1)
+    embed_bits(flat, np.unpackbits(np.frombuffer(segment, dtype=np.uint8)))
+    arr[select] = flat.reshape(arr[select].shape)
+
+
+def _read_frame(frame, nbytes, offset=0):
+    arr = np.asarray(frame)
+    carrier = arr[_select(arr, frame.info.get("transparency"))].reshape(-1)
+    bits = carrier[offset * 8:(offset + nbytes) * 8] & 1
+    return np.packbits(bits).tobytes()
+
+
+def _split(payload, capacities):
+    """Membagi payload ke frame berurutan; mengembalikan daftar panjang segmen."""
+    for used in range(1, len(capacities) + 1):
+        room = [capacities[0] - INDEX_SIZE - 4 * used] + list(capacities[1:used])
+        if room[0] >= 0 and sum(room) >= len(payload):
+            lengths = []
+            remaining = len(payload)
+            for cap in room:
+                lengths.append(min(cap, remaining))
+                remaining -= lengths[-1]
+            return lengths
+    raise MessageTooLargeError("Ukuran pesan terlalu besar untuk seluruh frame gambar ini!")
+
+
+def _save_frames(frames, output_path, fmt, source_info):
+    first, rest = frames[0], frames[1:]
+    durations = [f.info.get("duration", source_info.get("duration", 0)) or 0 for f in frames]
+    if fmt == "GIF":
+        # Frame utuh hasil komposit: "jangan dibuang", kecuali frame transparan
+        # yang harus dikembalikan ke latar agar komposit saat dibaca sama persis
+        disposal = [2 if "transparency" in f.info else 1 for f in frames]
+        if len(frames) == 1:
+            # Penulis GIF satu frame di Pillow hanya menerima nilai skalar
+            disposal, durations = disposal[0], durations[0]
+        # Palette global eksplisit 256 entri: tanpa ini Pillow menulis palette lokal
+        # per frame (dibuka kembali sebagai RGB) atau memetakan ulang indeks di luar palette
+        palette = None
+        if first.mode == "P":
+            palette = first.getpalette()
+            palette += [0] * (768 - len(palette))
+        first.save(output_path, format="GIF", save_all=True, append_images=rest,
+                   duration=durations, loop=source_info.get("loop", 0), disposal=disposal,
+                   optimize=False, palette=palette)
+    elif fmt == "PNG":
+        first.save(output_path, format="PNG", save_all=True, append_images=rest,
+                   duration=durations, loop=source_info.get("loop", 0), disposal=0, blend=0)
+    else:
+        compression = source_info.get("compression", "tiff_lzw")
+        if compression not in LOSSLESS_TIFF:
+            compression = "tiff_lzw"
+        first.save(output_path, format="TIFF", save_all=True, append_images=rest,
+                   compression=None if compression == "raw" else compression)
+
+
+def _load_frames(image_path, metrics):
+    with _gif_palette_frames(), metrics.stage("load"):
+        with Image.open(image_path) as img:
+            info = dict(img.info)
+            frames = [frame.copy() for frame in ImageSequence.Iterator(img)]
+    metrics.add("frames", len(frames))
+    return frames, info
+
+
+def encode_frames(image_path, output_path, secret_message, compression=None, level=None,
+                  workers=None, metrics=None):
+    """Menyisipkan pesan ke semua frame GIF/APNG/TIFF lalu menyimpannya ke ``output_path``.
+
+    Format keluaran ditentukan dari ekstensi ``output_path`` (``.gif``,
+    ``.png``/``.apng``, ``.tif``/``.tiff``); gambar satu frame juga
+    didukung, misalnya PNG/GIF palette. ``workers`` membatasi jumlah thread
+    penyisipan per frame (default: jumlah CPU).
+    """
+    metrics = metrics or NULL_METRICS
+    fmt = frame_format(output_path)
+    if fmt is None:
+        raise StegoError("Output multi-frame harus berupa GIF, PNG/APNG, atau TIFF.")
+    with metrics.stage("payload"):
+        payload = build_payload(secret_message, compression=compression, level=level)
+    frames, info = _load_frames(image_path, metrics)
+    with metrics.stage("convert"):
+        frames = _normalize_frames(frames, fmt)
+        arrays = [np.array(f) for f in frames]
+        selects = [_select(a, f.info.get("transparency")) for a, f in zip(arrays, frames)]
+    lengths = _split(payload, [_frame_capacity(a, s) for a, s in zip(arrays, selects)])
+    index = struct.pack(INDEX_FORMAT, INDEX_MAGIC, INDEX_VERSION, len(lengths))
+    index += struct.pack(f">{len(lengths)}I", *lengths)
+    segments, start = [], 0
+    for length in lengths:
+        segments.append(payload[start:start + length])
+        start += length
+    segments[0] = index + segments[0]
+    metrics.add("payload_bits", len(payload) * 8)
+    metrics.add("frames_touched", len(lengths))
+
+    with metrics.stage("embed"):
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+            list(pool.map(_embed_frame, arrays, selects, segments))
+    for i in range(1, len(lengths)):
+        # Penulis GIF/APNG Pillow menggabungkan frame yang identik dengan frame sebelumnya
+        if fmt != "TIFF" and np.array_equal(arrays[i], arrays[i - 1]):
+            raise StegoError(f"Frame {i} identik dengan frame sebelumnya setelah disisipi.")
+    with metrics.stage("to_image"):
+        out = []
+        for arr, frame in zip(arrays, frames):
+            image = Image.fromarray(arr, frame.mode)
+            if frame.mode == "P":
+                image.putpalette(frame.getpalette())
+            for key in ("transparency", "duration"):
+                if key in frame.info:
+                    image.info[key] = frame.info[key]
+            out.append(image)
+    with metrics.stage("save"):
+        _save_frames(out, output_path, fmt, info)
+    return output_path
+
+
+def decode_frames(image_path, workers=None, metrics=None):
+    """Mengekstrak pesan dari gambar multi-frame; hanya frame yang tercatat di indeks yang dibaca."""
+    metrics = metrics or NULL_METRICS
+    with _gif_palette_frames(), Image.open(image_path) as img:
+        frames = ImageSequence.Iterator(img)
+        with metrics.stage("load"):
+            first = _carrier_mode(next(frames).copy())
+        with metrics.stage("extract"):
+            head = _read_frame(first, INDEX_SIZE)
+        magic, version, count = struct.unpack(INDEX_FORMAT, head.ljust(INDEX_SIZE, b"\0"))
+        if magic != INDEX_MAGIC:
+            raise NoMessageError()
+        if version != INDEX_VERSION or count < 1:
+            raise PayloadError(f"Indeks payload multi-frame tidak dikenal (versi {version}).")
+        table = _read_frame(first, 4 * count, INDEX_SIZE)
+        if len(table) < 4 * count:
+            raise PayloadError("Indeks payload multi-frame terpotong.")
+        lengths = struct.unpack(f">{count}I", table)
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+            parts = [pool.submit(_read_frame, first, lengths[0], INDEX_SIZE + 4 * count)]
+            for length in lengths[1:]:
+                with metrics.stage("load"):
+                    frame = next(frames, None)
+                    if frame is None:
+                        raise PayloadError("Indeks payload menunjuk frame yang tidak ada.")
+                    frame = _carrier_mode(frame.copy())
+                parts.append(pool.submit(_read_frame, frame, length))
+            with metrics.stage("extract"):
+                payload = b"".join(part.result() for part in parts)
+    metrics.add("frames_read", count)
+    if len(payload) < sum(lengths):
+        raise PayloadError("Payload terpotong sebelum mencapai panjang pada indeks.")
+    header = parse_header(payload)
+    if header is None or HEADER_SIZE + header["length"] != len(payload):
+        raise PayloadError("Header payload multi-frame tidak valid.")
+    with metrics.stage("unpack"):
+        return unpack_payload(header, payload[HEADER_SIZE:])
+
+
+def decode_file(image_path, metrics=None, key=None):
+    """Mengekstrak pesan dari file gambar dengan jalur yang sesuai isinya.
+
+    PGM dibaca dengan :func:`decode_mapped` (satu bit per sampel abu-abu).
+    Gambar lain dibaca dengan :func:`decode_image`; jika tidak ada pesan,
+    frame pertama dicek apakah diawali indeks ``LSBF`` lalu dibaca dengan
+    :func:`decode_frames`. Jadi GIF/APNG/TIFF multi-frame maupun PNG/TIFF
+    satu frame hasil :func:`encode_frames` dikenali tanpa melihat format
+    atau jumlah frame.
+    """
+    if is_gray_pnm(image_path):
+        return decode_mapped(image_path, metrics=metrics, key=key)
+    try:
+        return decode_image(image_path, metrics=metrics, key=key)
+    except NoMessageError:
+        if key is not None:
+            raise
+    return decode_frames(image_path, metrics=metrics)
@@ -0,0 +1,98 @@
+"""Antrean pekerjaan di thread latar belakang untuk klien GUI.
+
+Pekerjaan dijalankan satu per satu di thread worker. Progres, hasil, dan
+error dikirim lewat ``queue.Queue`` yang aman antar-thread; klien memanggil
+:meth:`JobRunner.poll` dari thread utamanya (mis. lewat ``after()`` di Tk)
+sehingga semua callback berjalan di thread tersebut.
+"""
+
+import itertools
+import queue
+import threading
+
+from .errors import JobCancelled
+
+
+class Job:
+    """Satu pekerjaan dalam antrean beserta flag pembatalannya."""
+
+    def __init__(self, job_id, label, func, args, kwargs, callbacks):
+        self.id = job_id
+        self.label = label
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.callbacks = callbacks
+        self.cancel_event = threading.Event()
+        self.status = "queued"
+
+    def cancel(self):
+        """Meminta pembatalan; berlaku di titik cek progres berikutnya."""
+        self.cancel_event.set()
+
+
+class JobRunner:
+    """Menjalankan pekerjaan berurutan di satu thread daemon."""
+
+    def __init__(self):
+        self.jobs = queue.Queue()
+        self.events = queue.Queue()
+        self.pending = {}
+        self._ids = itertools.count(1)
+        self._thread = threading.Thread(target=self._run, name="lsbstego-jobs", daemon=True)
+        self._thread.start()
+
+    def submit(self, func, *args, label="", on_progress=None, on_done=None, on_error=None,
+               on_cancel=None, **kwargs):
+        """Menambahkan pekerjaan ke antrean dan mengembalikan objek :class:`Job`.
+
+        ``func`` menerima keyword ``progress`` berupa callback
+        ``(selesai, total)``; callback itu memunculkan :class:`JobCancelled`
+        jika pekerjaan sudah diminta batal.
+        """
+        callbacks = {"progress": on_progress, "done": on_done, "error": on_error,
+                     "cancelled": on_cancel}
+        job = Job(next(self._ids), label, func, args, kwargs, callbacks)
+        self.pending[job.id] = job
+        self.jobs.put(job)
+        return job
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if job.cancel_event.is_set():
+                self.events.put(("cancelled", job, None))
+                continue
+            job.status = "running"
+
+            def progress(done, total, job=job):
+                if job.cancel_event.is_set():
+                    raise JobCancelled("Pekerjaan dibatalkan.")
+                self.events.put(("progress", job, (done, total)))
+
+            try:
+                result = job.func(*job.args, progress=progress, **job.kwargs)
+            except JobCancelled:
+                self.events.put(("cancelled", job, None))
+            except Exception as e:
+                self.events.put(("error", job, e))
+            else:
+                self.events.put(("done", job, result))
+
+    def poll(self):
+        """Memproses semua event yang tertunda; panggil dari thread utama."""
+        while True:
+            try:
+                kind, job, value = self.events.get_nowait()
+            except queue.Empty:
+                return
+            if kind == "progress":
+                callback = job.callbacks["progress"]
+                if callback:
+                    callback(job, *value)
+                continue
+            job.status = kind
+            self.pending.pop(job.id, None)
+            callback = job.callbacks[kind]
+            if callback:
+                callback(job, value)
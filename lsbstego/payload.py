@@ -0,0 +1,173 @@
+"""Format payload: header berpanjang tetap dan format delimiter lama."""
+
+import struct
+import zlib
+
+import numpy as np
+
+from .compression import CODEC_IDS, compress, decompress
+from .ecc import ECC_IDS, ECC_NAMES
+from .errors import PayloadError
+
+# Format payload berheader: magic, versi, flags, panjang payload, CRC32
+HEADER_MAGIC = b"LSBS"
+HEADER_VERSION = 1
+HEADER_FORMAT = ">4sBBII"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+LEGACY_DELIMITER = b"#####"
+
+# Flag tata letak: bit 0-1 = (bit per channel - 1), bit 2 = channel alpha ikut dipakai.
+# Header selalu ditulis 1 bit per channel RGB di piksel-piksel pertama agar
+# decoder bisa membacanya sebelum mengetahui mode yang dipakai.
+FLAG_BITS_MASK = 0x03
+FLAG_ALPHA = 0x04
+LAYOUT_FLAGS = FLAG_BITS_MASK | FLAG_ALPHA
+HEADER_PIXELS = -(-HEADER_SIZE * 8 // 3)
+
+# Flag isi: bit 3-4 = nomor codec kompresi (0 = tanpa kompresi), bit 5 = data biner
+FLAG_CODEC_SHIFT = 3
+FLAG_CODEC_MASK = 0x18
+FLAG_BINARY = 0x20
+
+# Flag ECC: bit 6-7 = nomor skema koreksi galat (0 = tanpa ECC). Header dan isi
+# payload di-encode terpisah, jadi flag ini hanya terbaca setelah header di-decode.
+FLAG_ECC_SHIFT = 6
+FLAG_ECC_MASK = 0xC0
+
+
+def char_to_binary(chars):
+    """Mengubah string menjadi representasi biner."""
+    return ''.join(format(ord(i), '08b') for i in chars)
+
+
+def binary_to_char(binary):
+    """Mengubah representasi biner kembali menjadi string."""
+    chars = ""
+    for i in range(0, len(binary), 8):
+        byte = binary[i:i+8]
+        if len(byte) == 8:
+            chars += chr(int(byte, 2))
+    return chars
+
+
+def message_to_bits(chars):
+    """Mengubah string menjadi array bit (uint8 bernilai 0/1) sekaligus."""
+    try:
+        return np.unpackbits(np.frombuffer(chars.encode('latin-1'), dtype=np.uint8))
+    except UnicodeEncodeError:
+        # Karakter di luar Latin-1 menghasilkan lebih dari 8 bit per karakter,
+        # jadi gunakan representasi string agar hasilnya tetap sama seperti sebelumnya.
+        return np.frombuffer(char_to_binary(chars).encode('ascii'), dtype=np.uint8) - ord('0')
+
+
+def build_payload(secret_message, flags=0, compression=None, level=None):
+    """Membungkus pesan dengan header (magic, versi, flags, panjang, CRC32).
+
+    ``secret_message`` berupa ``str`` (disimpan sebagai UTF-8) atau ``bytes``
+    (disimpan apa adanya dan ditandai biner). Jika ``compression`` diisi
+    ("zlib", "lzma", "zstd"), data dikompres dulu dan codec-nya dicatat di
+    flag sehingga decoder mendekompres otomatis. Panjang dan CRC32 dihitung
+    dari data yang benar-benar disisipkan.
+    """
+    if isinstance(secret_message, str):
+        data = secret_message.encode('utf-8')
+    else:
+        data = bytes(secret_message)
+        flags |= FLAG_BINARY
+    if compression:
+        data = compress(data, compression, level)
+        flags |= CODEC_IDS[compression] << FLAG_CODEC_SHIFT
+    header = struct.pack(HEADER_FORMAT, HEADER_MAGIC, HEADER_VERSION, flags,
+                         len(data), zlib.crc32(data))
+    return header + data
+
+
+def parse_header(raw):
+    """Membaca header payload; mengembalikan None jika magic tidak cocok."""
+    if len(raw) < HEADER_SIZE:
+        return None
+    magic, version, flags, length, crc = struct.unpack(HEADER_FORMAT, raw[:HEADER_SIZE])
+    if magic != HEADER_MAGIC:
+        return None
+    if version != HEADER_VERSION:
+        raise PayloadError(f"Versi format payload tidak dikenal: {version}")
+    return {"version": version, "flags": flags, "length": length, "crc": crc}
+
+
+def verify_payload(header, data):
+    """Memastikan CRC32 isi payload sesuai dengan header."""
+    if zlib.crc32(data) != header["crc"]:
+        raise PayloadError("CRC32 payload tidak cocok, data rusak.")
+
+
+def unpack_payload(header, data):
+    """Memverifikasi isi payload, mendekompres bila perlu, lalu mengembalikannya.
+
+    Hasilnya ``bytes`` untuk payload biner dan ``str`` untuk teks.
+    """
+    verify_payload(header, data)
+    codec_id = (header["flags"] & FLAG_CODEC_MASK) >> FLAG_CODEC_SHIFT
+    if codec_id:
+        data = decompress(data, codec_id)
+    if header["flags"] & FLAG_BINARY:
+        return data
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError as e:
+        raise PayloadError(f"Payload teks bukan UTF-8 yang valid: {e}")
+
+
+def layout_flags(bits_per_channel=1, alpha=False):
+    """Menyusun flag tata letak untuk jumlah bit per channel dan pemakaian alpha."""
+    if not 1 <= bits_per_channel <= 4:
+        raise ValueError("Jumlah bit per channel harus 1 sampai 4.")
+    return (bits_per_channel - 1) | (FLAG_ALPHA if alpha else 0)
+
+
+def capacity_bits(width, height, bits_per_channel=1, alpha=False):
+    """Jumlah bit payload (header + isi) yang muat di gambar berukuran ``width`` x ``height``.
+
+    Pada mode default header dan isi berbagi LSB RGB; pada mode lain header
+    memakai ``HEADER_PIXELS`` piksel pertama dan isi memakai sisanya.
+    """
+    flags = layout_flags(bits_per_channel, alpha)
+    pixels = width * height
+    if not flags:
+        return pixels * 3
+    if pixels <= HEADER_PIXELS:
+        return 0
+    channels = 4 if alpha else 3
+    return HEADER_SIZE * 8 + (pixels - HEADER_PIXELS) * channels * bits_per_channel
+
+
+def ecc_flags(ecc=None):
+    """Menyusun flag ECC untuk nama skema (``None`` = tanpa ECC)."""
+    if not ecc:
+        return 0
+    if ecc not in ECC_IDS:
+        raise ValueError(f"Skema ECC tidak dikenal: {ecc}")
+    return ECC_IDS[ecc] << FLAG_ECC_SHIFT
+
+
+def header_ecc(header):
+    """Nama skema ECC dari flag header, atau None."""
+    return ECC_NAMES.get((header["flags"] & FLAG_ECC_MASK) >> FLAG_ECC_SHIFT)
+
+
+def header_layout(header):
+    """Mengembalikan (bit per channel, pakai alpha) dari flag header."""
+    flags = header["flags"]
+    return (flags & FLAG_BITS_MASK) + 1, bool(flags & FLAG_ALPHA)
+
+
+def looks_like_legacy(prefix):
+    """Cek cepat apakah awal bidang LSB berupa teks format delimiter lama.
+
+    Pesan lama selalu berupa teks, jadi karakter kontrol sebelum delimiter
+    berarti gambar hampir pasti tidak berisi pesan dan tidak perlu dipindai.
+    """
+    end = prefix.find(LEGACY_DELIMITER)
+    if end != -1:
+        prefix = prefix[:end]
+    return all((b >= 0x20 and b != 0x7f and not 0x80 <= b < 0xa0) or b in b"\t\n\r"
+               for b in prefix)
@@ -0,0 +1,141 @@
+"""Thumbnail preview cepat dan cache LRU berbatas memori untuk klien GUI.
+
+Entri cache (thumbnail hasil decode maupun objek tampilan klien) dikunci
+dengan path, mtime, dan ukuran file (:func:`file_key`) sehingga file yang
+ditimpa otomatis dianggap baru. Thumbnail JPEG memakai
+mode draft (decoder men-skala DCT langsung ke 1/2-1/8), format lain
+dikecilkan dulu dengan ``reduce`` sebelum LANCZOS.
+"""
+
+import math
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image
+
+PREVIEW_SIZE = (300, 300)
+
+
+def file_key(path):
+    """Kunci cache untuk sebuah file: (path absolut, mtime_ns, ukuran)."""
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+class LRUCache:
+    """Cache LRU dengan batas total byte; entri terlama dibuang lebih dulu.
+
+    Biaya tiap entri ditentukan pemanggil saat :meth:`put`. Entri yang lebih
+    besar dari seluruh anggaran tidak disimpan.
+    """
+
+    def __init__(self, max_bytes=64 << 20):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Mengambil entri dan menandainya sebagai yang terakhir dipakai."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return default
+            self.entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, nbytes):
+        """Menyimpan entri lalu membuang entri terlama sampai muat dalam anggaran."""
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[1]
+            if nbytes > self.max_bytes:
+                return
+            self.entries[key] = (value, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                _, (_, size) = self.entries.popitem(last=False)
+                self.nbytes -= size
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.nbytes = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+
+def image_nbytes(img):
+    """Perkiraan memori sebuah gambar Pillow yang sudah di-decode."""
+    return img.width * img.height * len(img.getbands())
+
+
+def load_thumbnail(path, max_size=PREVIEW_SIZE):
+    """Membuka gambar dan mengembalikan thumbnail RGB/RGBA (paling besar ``max_size``)."""
+    img = Image.open(path)
+    if img.format == "JPEG":
+        # Skala DCT langsung di decoder: gambar 8K hanya di-decode ~1/8
+        img.draft("RGB", (max_size[0] * 2, max_size[1] * 2))
+    if img.mode not in ("RGB", "RGBA"):
+        # Mode palette/1-bit tidak bisa di-resample LANCZOS
+        img = img.convert("RGBA" if "transparency" in img.info or "A" in img.mode else "RGB")
+    img.thumbnail(max_size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+    return img
+
+
+def cached_thumbnail(cache, path, max_size=PREVIEW_SIZE, image=None):
+    """Thumbnail ``path`` dari ``cache``; jika belum ada, di-decode lalu disimpan.
+
+    ``image`` (opsional) adalah thumbnail yang sudah ada di memori, mis. hasil
+    encoder, dan disimpan tanpa membaca file.
+    """
+    key = ("thumbnail", file_key(path), tuple(max_size))
+    img = cache.get(key)
+    if img is None:
+        img = image or load_thumbnail(path, max_size)
+        cache.put(key, img, image_nbytes(img))
+    return img
+
+
+class StripThumbnail:
+    """Menyusun thumbnail dari strip-strip RGB tanpa menyimpan frame penuh.
+
+    Tiap strip dikecilkan dengan box filter (``Image.reduce``) dengan faktor
+    bulat; sisa baris yang belum genap satu faktor disimpan untuk strip
+    berikutnya. :meth:`image` menghaluskan hasilnya ke ``max_size`` dengan
+    LANCZOS.
+    """
+
+    def __init__(self, width, height, max_size=PREVIEW_SIZE):
+        self.max_size = max_size
+        self.factor = max(1, math.floor(max(width / max_size[0], height / max_size[1]) / 2))
+        self.pending = None
+        self.rows = []
+
+    def _reduce(self, strip):
+        return np.asarray(Image.fromarray(strip).reduce(self.factor))
+
+    def add(self, strip):
+        """Menambahkan strip (H, W, 3) berikutnya."""
+        if self.pending is not None:
+            strip = np.concatenate((self.pending, strip))
+        usable = len(strip) - len(strip) % self.factor
+        self.pending = strip[usable:].copy() if usable < len(strip) else None
+        if usable:
+            self.rows.append(self._reduce(strip[:usable]))
+
+    def image(self):
+        """Thumbnail akhir sebagai gambar Pillow."""
+        if self.pending is not None:
+            self.rows.append(self._reduce(self.pending))
+            self.pending = None
+        img = Image.fromarray(np.concatenate(self.rows))
+        img.thumbnail(self.max_size, Image.Resampling.LANCZOS)
+        return img
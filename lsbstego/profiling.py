@@ -0,0 +1,102 @@
+"""Instrumentasi opsional: waktu per tahap dan penghitung di jalur encode/decode.
+
+Semua fungsi codec menerima ``metrics=None``. Tanpa objek :class:`Metrics`
+yang dipakai adalah :data:`NULL_METRICS` yang semua metodenya no-op, sehingga
+biaya saat instrumentasi mati hanya satu panggilan metode kosong per tahap.
+"""
+
+import time
+
+
+class _Stage:
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.record(self.name, time.perf_counter() - self.start)
+
+
+class Metrics:
+    """Mengumpulkan durasi per tahap dan penghitung (piksel, byte, dll.).
+
+    ``callback`` (opsional) dipanggil dengan ``(nama_tahap, detik)`` setiap
+    kali sebuah tahap selesai, misalnya untuk diteruskan ke sistem metrik.
+    """
+
+    def __init__(self, callback=None):
+        self.stages = {}
+        self.counters = {}
+        self.callback = callback
+
+    def stage(self, name):
+        """Context manager yang mengukur durasi sebuah tahap."""
+        return _Stage(self, name)
+
+    def record(self, name, seconds):
+        """Menambahkan durasi ke tahap ``name`` (tahap berulang dijumlahkan)."""
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+        if self.callback is not None:
+            self.callback(name, seconds)
+
+    def add(self, name, value=1):
+        """Menambah penghitung ``name`` sebesar ``value``."""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def timed_iter(self, name, iterable):
+        """Membungkus iterable sehingga waktu menunggu item dicatat sebagai tahap ``name``."""
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.record(name, time.perf_counter() - start)
+                return
+            self.record(name, time.perf_counter() - start)
+            yield item
+
+    def to_dict(self):
+        """Ringkasan yang siap di-serialisasi ke JSON."""
+        return {
+            "stages": dict(self.stages),
+            "total_seconds": sum(self.stages.values()),
+            "counters": dict(self.counters),
+        }
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _NullMetrics:
+    """Pengganti :class:`Metrics` saat instrumentasi tidak aktif."""
+
+    _stage = _NullStage()
+
+    def stage(self, name):
+        return self._stage
+
+    def record(self, name, seconds):
+        pass
+
+    def add(self, name, value=1):
+        pass
+
+    def timed_iter(self, name, iterable):
+        return iterable
+
+
+NULL_METRICS = _NullMetrics()
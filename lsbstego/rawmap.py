@@ -0,0 +1,228 @@
+"""Jalur cepat memory-mapped untuk BMP, PPM/PGM, dan buffer RGB mentah.
+
+Format tak terkompresi menyimpan piksel di offset yang bisa dihitung dari
+header, jadi file cukup di-``mmap`` lalu LSB dibaca/ditulis langsung lewat
+view NumPy tanpa decode, konversi, maupun simpan ulang lewat Pillow. Urutan
+channel pada view selalu R, G, B dari baris paling atas, sama seperti
+encoder biasa, sehingga hasilnya tetap bisa di-decode dengan ``decode_image``.
+
+Pengecualiannya PGM (P5): bit ditulis 1 per sampel abu-abu, sedangkan
+``decode_image`` mengubah gambar abu-abu ke RGB dan membaca aliran bit yang
+berbeda. PGM hanya bisa di-decode lewat :func:`decode_mapped`;
+``decode_file`` (dan CLI ``decode``) memilih jalur ini otomatis.
+"""
+
+import mmap
+import os
+import shutil
+import struct
+import traceback
+
+import numpy as np
+
+from .codec import decode_chunks, iter_lsb_bytes, payload_bits, read_layout_payload
+from .errors import MessageTooLargeError, StegoError
+from .profiling import NULL_METRICS
+from .scatter import decode_scattered, embed_scattered
+
+MAPPABLE_EXTENSIONS = (".bmp", ".dib", ".ppm", ".pgm", ".pnm")
+
+
+class MappedImage:
+    """File gambar yang di-mmap beserta view piksel (H, W, C) di atasnya."""
+
+    def __init__(self, path, write=False, raw_shape=None, raw_offset=0):
+        self.file = open(path, "r+b" if write else "rb")
+        try:
+            access = mmap.ACCESS_WRITE if write else mmap.ACCESS_READ
+            self.mm = mmap.mmap(self.file.fileno(), 0, access=access)
+        except (ValueError, OSError):
+            self.file.close()
+            raise
+        try:
+            buffer = np.frombuffer(self.mm, dtype=np.uint8)
+            if raw_shape is not None:
+                height, width, channels = raw_shape
+                self.pixels = _raw_view(buffer, raw_offset, width, height, channels)
+            elif self.mm[:2] == b"BM":
+                self.pixels = _bmp_view(buffer, self.mm)
+            elif self.mm[:2] in (b"P5", b"P6"):
+                self.pixels = _pnm_view(buffer, self.mm)
+            else:
+                raise StegoError("Format tidak didukung untuk jalur mmap (hanya BMP/PPM/PGM/raw).")
+        except BaseException as e:
+            # Frame di traceback masih memegang view ke mmap; lepaskan dulu agar bisa ditutup
+            buffer = None
+            traceback.clear_frames(e.__traceback__)
+            self.mm.close()
+            self.file.close()
+            raise
+        if not write:
+            self.pixels.flags.writeable = False
+
+    @property
+    def capacity_bits(self):
+        return self.pixels.size
+
+    def close(self):
+        """Melepas view lalu menutup mmap (perubahan ditulis ke file)."""
+        self.pixels = None
+        if not self.mm.closed:
+            self.mm.flush()
+            self.mm.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if tb is not None:
+            # Frame yang gagal (mis. kunci salah) masih memegang view; lepaskan sebelum close
+            traceback.clear_frames(tb)
+        self.close()
+
+
+def _raw_view(buffer, offset, width, height, channels, stride=None):
+    stride = stride or width * channels
+    if offset + stride * height > len(buffer):
+        raise StegoError("File lebih kecil dari ukuran piksel yang diharapkan.")
+    rows = buffer[offset:offset + stride * height].reshape(height, stride)
+    return rows[:, :width * channels].reshape(height, width, channels)
+
+
+def _bmp_view(buffer, mm):
+    pixel_offset, = struct.unpack_from("<I", mm, 10)
+    header_size, width, height, _, bpp, compression = struct.unpack_from("<IiiHHI", mm, 14)
+    if header_size < 40 or bpp not in (24, 32) or compression not in (0, 3):
+        raise StegoError("Hanya BMP 24/32-bit tanpa kompresi yang didukung jalur mmap.")
+    if compression == 3 and bpp == 32:
+        masks = struct.unpack_from("<III", mm, 54)
+        if masks != (0x00FF0000, 0x0000FF00, 0x000000FF):
+            raise StegoError("Bitfield BMP tidak standar tidak didukung jalur mmap.")
+    channels = bpp // 8
+    stride = (width * channels + 3) & ~3
+    view = _raw_view(buffer, pixel_offset, width, abs(height), channels, stride)
+    if height > 0:
+        # BMP bottom-up: baris pertama gambar ada di akhir data
+        view = view[::-1]
+    # Urutan byte BGR(A) -> view RGB tanpa salinan
+    return view[:, :, 2::-1]
+
+
+def _pnm_view(buffer, mm):
+    tokens = []
+    pos, size = 2, len(mm)
+    while len(tokens) < 3:
+        while pos < size and mm[pos:pos + 1].isspace():
+            pos += 1
+        if mm[pos:pos + 1] == b"#":
+            end = mm.find(b"\n", pos)
+            if end < 0:
+                break
+            pos = end + 1
+            continue
+        start = pos
+        while pos < size and not mm[pos:pos + 1].isspace():
+            pos += 1
+        if pos >= size or not mm[start:pos].isdigit():
+            # Token terakhir harus diikuti satu whitespace sebelum data piksel
+            break
+        tokens.append(int(mm[start:pos]))
+    if len(tokens) < 3:
+        raise StegoError("Header PPM/PGM terpotong atau tidak valid.")
+    width, height, maxval = tokens
+    if maxval > 255:
+        raise StegoError("PPM/PGM 16-bit tidak didukung jalur mmap.")
+    channels = 3 if mm[:2] == b"P6" else 1
+    return _raw_view(buffer, pos + 1, width, height, channels)
+
+
+def is_gray_pnm(path):
+    """True untuk PGM biner (P5), yang payload-nya hanya terbaca lewat :func:`decode_mapped`."""
+    with open(path, "rb") as f:
+        return f.read(2) == b"P5"
+
+
+def is_mappable(path):
+    """Cek cepat (dari ekstensi) apakah file bisa diproses lewat jalur mmap."""
+    return path.lower().endswith(MAPPABLE_EXTENSIONS)
+
+
+def embed_bits_view(view, bits):
+    """Menulis bit ke LSB view (H, W, C) yang mungkin tidak kontigu, in-place."""
+    height, width, channels = view.shape
+    row_channels = width * channels
+    full = min(height, len(bits) // row_channels)
+    if full:
+        target = view[:full]
+        np.bitwise_and(target, 0xFE, out=target)
+        np.bitwise_or(target, bits[:full * row_channels].reshape(full, width, channels), out=target)
+    rest = bits[full * row_channels:]
+    if len(rest):
+        row = view[full]
+        pixels, extra = divmod(len(rest), channels)
+        if pixels:
+            target = row[:pixels]
+            np.bitwise_and(target, 0xFE, out=target)
+            np.bitwise_or(target, rest[:pixels * channels].reshape(pixels, channels), out=target)
+        if extra:
+            target = row[pixels, :extra]
+            np.bitwise_and(target, 0xFE, out=target)
+            np.bitwise_or(target, rest[pixels * channels:], out=target)
+    return view
+
+
+def encode_mapped(image_path, secret_message, output_path=None, legacy=False,
+                  raw_shape=None, raw_offset=0, compression=None, level=None, metrics=None,
+                  key=None, ecc=None):
+    """Menyisipkan pesan langsung di file lewat mmap.
+
+    Jika ``output_path`` diberikan, file disalin dulu lalu salinannya yang
+    diubah; jika tidak, file sumber diubah di tempat. Dengan ``key``, bit
+    disebar ke posisi berkunci seperti ``encode_image(..., key=...)``; ``ecc``
+    menambah koreksi galat (tidak bisa digabung dengan ``key``).
+    """
+    metrics = metrics or NULL_METRICS
+    if key is not None and legacy:
+        raise ValueError("Mode berkunci hanya mendukung format berheader 1 bit per channel RGB.")
+    if key is not None and ecc:
+        raise ValueError("ECC hanya didukung pada mode default 1 bit per channel RGB tanpa kunci.")
+    with metrics.stage("payload"):
+        bits = payload_bits(secret_message, legacy, compression=compression, level=level,
+                            ecc=ecc)
+    with metrics.stage("map"):
+        with MappedImage(image_path, raw_shape=raw_shape, raw_offset=raw_offset) as img:
+            if len(bits) > img.capacity_bits:
+                raise MessageTooLargeError("Ukuran pesan terlalu besar untuk gambar ini!")
+    if output_path is not None and os.path.abspath(output_path) != os.path.abspath(image_path):
+        with metrics.stage("copy"):
+            shutil.copyfile(image_path, output_path)
+        image_path = output_path
+    with MappedImage(image_path, write=True, raw_shape=raw_shape, raw_offset=raw_offset) as img:
+        if key is not None:
+            with metrics.stage("embed"):
+                embed_scattered(img.pixels, bits, key)
+            metrics.add("pixels_touched", len(bits))
+            return image_path
+        with metrics.stage("embed"):
+            embed_bits_view(img.pixels, bits)
+        metrics.add("pixels_touched", -(-len(bits) // img.pixels.shape[2]))
+    return image_path
+
+
+def decode_mapped(image_path, raw_shape=None, raw_offset=0, metrics=None, key=None):
+    """Mengekstrak pesan lewat mmap; hanya halaman yang memuat payload yang dibaca."""
+    metrics = metrics or NULL_METRICS
+    with metrics.stage("map"):
+        img = MappedImage(image_path, raw_shape=raw_shape, raw_offset=raw_offset)
+    with img:
+        if key is not None:
+            return decode_scattered(img.pixels, key, metrics)
+        chunks = iter_lsb_bytes(img.pixels)
+        try:
+            return decode_chunks(chunks, img.capacity_bits // 8,
+                                 lambda header: read_layout_payload(img.pixels, header, metrics),
+                                 metrics)
+        finally:
+            # Lepaskan view milik generator sebelum mmap ditutup
+            chunks.close()
@@ -0,0 +1,142 @@
+"""Mode berkunci: bit payload disebar ke channel pilihan permutasi Feistel.
+
+Bit ke-``i`` dari aliran payload (header + isi, 1 bit per channel RGB)
+ditulis ke channel ``perm(i)``. Permutasi dihitung per indeks dalam O(1):
+jaringan Feistel (dua bagian yang bergantian ukurannya) pada domain 2^b
+terkecil yang memuat jumlah channel, dengan *cycle walking* untuk hasil di
+luar rentang; karena domain < 2n, rata-rata kurang dari dua putaran. Tidak ada array
+indeks sepanjang gambar yang perlu diacak, sehingga memori tetap datar, dan
+decode hanya menyentuh channel yang memuat payload.
+
+Fungsi ronde tidak dirancang sebagai enkripsi; kunci hanya menentukan
+posisi. Enkripsi pesan sendiri jika isinya harus rahasia.
+"""
+
+import hashlib
+
+import numpy as np
+
+from .errors import NoMessageError, PayloadError
+from .payload import FLAG_ECC_MASK, HEADER_SIZE, LAYOUT_FLAGS, parse_header, unpack_payload
+from .profiling import NULL_METRICS
+
+ROUNDS = 6
+BLOCK_BITS = 1 << 20
+
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+_SHIFT1 = np.uint64(31)
+_SHIFT2 = np.uint64(29)
+
+
+class FeistelPermutation:
+    """Permutasi berkunci atas ``range(size)`` yang bisa dievaluasi per indeks."""
+
+    def __init__(self, size, key):
+        if size < 1:
+            raise ValueError("Ukuran domain permutasi minimal 1.")
+        if isinstance(key, str):
+            key = key.encode("utf-8")
+        self.size = size
+        bits = max(2, (size - 1).bit_length())
+        # Bagian kiri ``high`` bit, kanan ``low`` bit; ukurannya bertukar tiap ronde
+        self.low = bits // 2
+        self.high = bits - self.low
+        self.shift = np.uint64(self.low)
+        self.masks = (np.uint64((1 << self.high) - 1), np.uint64((1 << self.low) - 1))
+        digest = hashlib.blake2b(bytes(key), digest_size=8 * ROUNDS,
+                                 person=b"lsbstego-perm").digest()
+        self.round_keys = np.frombuffer(digest, dtype=">u8").astype(np.uint64)
+
+    @staticmethod
+    def _round(half, round_key, mask):
+        x = (half ^ round_key) * _MIX1
+        x ^= x >> _SHIFT1
+        x *= _MIX2
+        x ^= x >> _SHIFT2
+        return x & mask
+
+    def _forward(self, values):
+        left, right = values >> self.shift, values & self.masks[1]
+        for i, round_key in enumerate(self.round_keys):
+            # ``left`` selalu selebar masks[i % 2]
+            left, right = right, left ^ self._round(right, round_key, self.masks[i % 2])
+        return (left << self.shift) | right
+
+    def _backward(self, values):
+        left, right = values >> self.shift, values & self.masks[1]
+        for i in reversed(range(ROUNDS)):
+            left, right = right ^ self._round(left, self.round_keys[i], self.masks[i % 2]), left
+        return (left << self.shift) | right
+
+    def _walk(self, values, step):
+        out = step(np.atleast_1d(np.asarray(values, dtype=np.uint64)))
+        outside = np.flatnonzero(out >= self.size)
+        while len(outside):
+            out[outside] = step(out[outside])
+            outside = outside[out[outside] >= self.size]
+        return out.astype(np.int64)
+
+    def __call__(self, indices):
+        """Posisi channel untuk indeks aliran bit (array int64)."""
+        return self._walk(indices, self._forward)
+
+    def inverse(self, positions):
+        """Indeks aliran bit untuk posisi channel (kebalikan :meth:`__call__`)."""
+        return self._walk(positions, self._backward)
+
+
+def _indexer(view):
+    # Array kontigu cukup diindeks datar; view lain (mis. mmap BMP) lewat (baris, kolom, channel)
+    if view.flags.c_contiguous:
+        flat = view.reshape(-1)
+        return flat, lambda positions: positions
+    return view, lambda positions: np.unravel_index(positions, view.shape)
+
+
+def embed_scattered(view, bits, key):
+    """Menulis bit ke LSB channel ``view`` (H, W, C) di posisi permutasi berkunci, in-place.
+
+    ``view`` boleh tidak kontigu (mis. view mmap).
+    """
+    perm = FeistelPermutation(view.size, key)
+    target, where = _indexer(view)
+    for start in range(0, len(bits), BLOCK_BITS):
+        block = bits[start:start + BLOCK_BITS]
+        index = where(perm(np.arange(start, start + len(block))))
+        target[index] = (target[index] & 0xFE) | block
+    return view
+
+
+def _read_bytes(view, perm, start, nbytes):
+    source, where = _indexer(view)
+    out = bytearray()
+    end = (start + nbytes) * 8
+    for first in range(start * 8, end, BLOCK_BITS):
+        index = where(perm(np.arange(first, min(first + BLOCK_BITS, end))))
+        out += np.packbits(source[index] & 1).tobytes()
+    return bytes(out)
+
+
+def decode_scattered(view, key, metrics=None):
+    """Mengekstrak pesan berkunci; hanya channel milik header dan isi payload yang dibaca."""
+    metrics = metrics or NULL_METRICS
+    capacity = view.size // 8
+    if capacity < HEADER_SIZE:
+        raise NoMessageError()
+    perm = FeistelPermutation(view.size, key)
+    with metrics.stage("extract"):
+        header = parse_header(_read_bytes(view, perm, 0, HEADER_SIZE))
+    if header is None:
+        metrics.add("lsb_bytes_needed", HEADER_SIZE)
+        raise NoMessageError("Tidak ada pesan yang ditemukan dengan kunci ini.")
+    total = HEADER_SIZE + header["length"]
+    if header["flags"] & (LAYOUT_FLAGS | FLAG_ECC_MASK) or total > capacity:
+        raise PayloadError("Header payload berkunci tidak valid.")
+    with metrics.stage("extract"):
+        data = _read_bytes(view, perm, HEADER_SIZE, header["length"])
+    metrics.add("lsb_bytes_needed", total)
+    # Tiap bit berada di channel berbeda, jadi paling banyak satu piksel per bit
+    metrics.add("pixels_read", total * 8)
+    with metrics.stage("unpack"):
+        return unpack_payload(header, data)
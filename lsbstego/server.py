@@ -0,0 +1,497 @@
+"""Layanan HTTP asyncio (TCP atau Unix socket) untuk encode/decode.
+
+Body request dialirkan per potongan ke file sementara, lalu hanya path-nya
+yang dikirim ke pool proses; gambar tidak pernah disimpan utuh di memori
+server maupun di-pickle ke worker. Jumlah request yang diproses sekaligus
+dibatasi ``max_in_flight``. Request berikutnya menunggu di antrean sepanjang
+``max_queue`` sebelum ditolak dengan 503. Selama menunggu, body-nya belum
+dibaca, sehingga klien tertahan oleh flow control TCP.
+
+Endpoint:
+
+- ``POST /encode``: body berisi gambar, hasilnya PNG. Pesan dikirim lewat
+  query ``message``, atau sebagai ``X-Payload-Length`` byte pertama body
+  (``?binary=1`` untuk data biner). Opsi lain mengikuti CLI: ``legacy``,
+  ``bits``, ``alpha``, ``compress``, ``level``, ``ecc``, ``png_level``,
+  ``png_strategy``, ``png_filter``, ``png_optimize``, ``png_threads``.
+- ``POST /decode``: body berisi gambar; hasilnya teks (``text/plain``) atau
+  data biner (``application/octet-stream``).
+- ``GET /metrics``: latensi p50/p99, kedalaman antrean, dan penghitung (JSON).
+- ``GET /health``
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from PIL import Image
+
+from .codec import encode_image
+from .compression import available_codecs
+from .ecc import ECC_IDS
+from .errors import StegoError
+from .frames import decode_file
+from .pngout import FILTERS, STRATEGIES, save_image
+
+CHUNK_BYTES = 64 << 10
+MAX_HEADER_BYTES = 64 << 10
+MAX_BODY_BYTES = 256 << 20
+LATENCY_SAMPLES = 1024
+
+REASONS = {
+    100: "Continue", 200: "OK", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 413: "Payload Too Large", 422: "Unprocessable Entity",
+    500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+
+class _HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class _BadImageError(StegoError):
+    """Body request bukan gambar yang bisa dibaca (pesan tetap, tanpa path server)."""
+
+    def __init__(self, message="Body request bukan gambar yang didukung atau file gambar rusak."):
+        super().__init__(message)
+
+
+def _encode_job(input_path, output_path, message, options, png_options):
+    try:
+        img = encode_image(input_path, message, **options)
+    except (OSError, Image.DecompressionBombError):
+        # Pesan asli menyebut path file spool di server
+        raise _BadImageError() from None
+    save_image(img, output_path, **png_options)
+
+
+def _decode_job(input_path):
+    try:
+        return decode_file(input_path)
+    except (OSError, Image.DecompressionBombError):
+        raise _BadImageError() from None
+
+
+def _percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[max(0, min(len(ordered) - 1, int(round(q / 100 * len(ordered) + 0.5)) - 1))]
+
+
+class ServiceMetrics:
+    """Penghitung, kedalaman antrean, dan sampel latensi terakhir per operasi."""
+
+    def __init__(self):
+        self.counters = {"requests": 0, "completed": 0, "failed": 0, "rejected": 0}
+        self.latencies = {}
+        self.in_flight = 0
+        self.queued = 0
+        self.pool_pending = 0
+
+    def add(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name, seconds):
+        """Mencatat satu sampel latensi (hanya ``LATENCY_SAMPLES`` terakhir yang disimpan)."""
+        self.latencies.setdefault(name, deque(maxlen=LATENCY_SAMPLES)).append(seconds)
+
+    def to_dict(self):
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "pool_pending": self.pool_pending,
+            "counters": dict(self.counters),
+            "latency": {
+                name: {"count": len(samples), "p50": _percentile(samples, 50),
+                       "p99": _percentile(samples, 99), "max": max(samples)}
+                for name, samples in self.latencies.items() if samples
+            },
+        }
+
+
+class _Request:
+    def __init__(self, method, target, version, headers, reader, writer):
+        self.method = method
+        url = urlsplit(target)
+        self.path = url.path
+        self.query = {k: v[-1] for k, v in parse_qs(url.query, keep_blank_values=True).items()}
+        self.headers = headers
+        self.reader = reader
+        self.writer = writer
+        connection = headers.get("connection", "").lower()
+        self.keep_alive = (connection != "close" if version == "HTTP/1.1"
+                           else connection == "keep-alive")
+        self.chunked = headers.get("transfer-encoding", "").lower() == "chunked"
+        try:
+            self.length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise _HttpError(400, "Content-Length tidak valid.")
+        self.body_done = not self.chunked and self.length == 0
+
+    async def body(self):
+        """Menghasilkan body request per potongan (Content-Length atau chunked)."""
+        if self.headers.get("expect", "").lower() == "100-continue":
+            self.writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+        reader = self.reader
+        if self.chunked:
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                if size == 0:
+                    while await reader.readuntil(b"\r\n") != b"\r\n":
+                        pass
+                    break
+                async for chunk in self._read(size):
+                    yield chunk
+                await reader.readexactly(2)
+        else:
+            async for chunk in self._read(self.length):
+                yield chunk
+        self.body_done = True
+
+    async def _read(self, remaining):
+        while remaining:
+            chunk = await self.reader.read(min(remaining, CHUNK_BYTES))
+            if not chunk:
+                raise asyncio.IncompleteReadError(b"", remaining)
+            remaining -= len(chunk)
+            yield chunk
+
+
+class _Response:
+    def __init__(self, status, body=b"", content_type="application/json", file_path=None,
+                 headers=None):
+        self.status = status
+        self.body = body
+        self.content_type = content_type
+        self.file_path = file_path
+        self.headers = headers or {}
+
+
+def _json_response(status, data):
+    return _Response(status, json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+
+def _error_response(status, error):
+    return _json_response(status, {"error": str(error), "type": type(error).__name__.lstrip("_")})
+
+
+async def _read_request(reader, writer):
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if e.partial.strip():
+            raise _HttpError(400, "Header request terpotong.")
+        return None
+    except asyncio.LimitOverrunError:
+        raise _HttpError(400, "Header request terlalu besar.")
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ", 2)
+    except ValueError:
+        raise _HttpError(400, "Baris request tidak valid.")
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    return _Request(method, target, version, headers, reader, writer)
+
+
+def _flag(query, name):
+    return query.get(name, "0").lower() in ("1", "true", "yes", "")
+
+
+def _int(query, name, default=None, low=None, high=None):
+    if name not in query:
+        return default
+    try:
+        value = int(query[name])
+    except ValueError:
+        raise _HttpError(400, f"Parameter '{name}' harus berupa angka.")
+    if low is not None and value < low:
+        raise _HttpError(400, f"Parameter '{name}' minimal {low}.")
+    if high is not None and value > high:
+        raise _HttpError(400, f"Parameter '{name}' maksimal {high}.")
+    return value
+
+
+def _choice(query, name, choices, default=None):
+    value = query.get(name, default)
+    if value is not None and value not in choices:
+        raise _HttpError(400, f"Parameter '{name}' harus salah satu dari: {', '.join(choices)}.")
+    return value
+
+
+def encode_options(query):
+    """Mengubah query string ``/encode`` menjadi kwargs ``encode_image`` dan ``save_image``."""
+    options = {
+        "legacy": _flag(query, "legacy"),
+        "bits_per_channel": _int(query, "bits", 1, 1, 4),
+        "alpha": _flag(query, "alpha"),
+        "compression": _choice(query, "compress", available_codecs()),
+        "level": _int(query, "level"),
+        "ecc": _choice(query, "ecc", list(ECC_IDS)),
+    }
+    png_options = {
+        "compress_level": _int(query, "png_level", None, 0, 9),
+        "strategy": _choice(query, "png_strategy", list(STRATEGIES), "default"),
+        "filter_type": _choice(query, "png_filter", FILTERS),
+        "optimize": _flag(query, "png_optimize"),
+        "threads": _int(query, "png_threads", 1, 0),
+    }
+    return options, png_options
+
+
+class StegoServer:
+    """Server HTTP asyncio dengan pool proses dan batas request yang diproses.
+
+    ``workers`` adalah jumlah proses (default jumlah CPU), ``max_in_flight``
+    batas request yang diproses sekaligus (default dua kali worker), dan
+    ``max_queue`` batas request yang menunggu (default empat kali
+    ``max_in_flight``). Body lebih dari ``max_body`` byte ditolak dengan 413.
+    """
+
+    def __init__(self, workers=None, max_in_flight=None, max_queue=None,
+                 max_body=MAX_BODY_BYTES, spool_dir=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight or self.workers * 2
+        self.max_queue = self.max_in_flight * 4 if max_queue is None else max_queue
+        self.max_body = max_body
+        self.spool_dir = spool_dir
+        self.metrics = ServiceMetrics()
+        self.pool = None
+        self.slots = None
+        self.servers = []
+        self.routes = {
+            "/encode": ("POST", self._encode, True),
+            "/decode": ("POST", self._decode, True),
+            "/metrics": ("GET", self._metrics, False),
+            "/health": ("GET", self._health, False),
+        }
+
+    async def start(self, host="127.0.0.1", port=8080, unix_path=None):
+        """Mulai mendengarkan di TCP ``host:port`` atau Unix socket ``unix_path``.
+
+        Boleh dipanggil lebih dari sekali untuk membuka beberapa alamat
+        dengan pool yang sama. Mengembalikan objek ``asyncio.Server``.
+        """
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(self.workers)
+            self.slots = asyncio.Semaphore(self.max_in_flight)
+            # Worker di-fork saat tugas pertama; jalankan sekarang, sebelum ada koneksi,
+            # agar worker tidak mewarisi socket klien (tanpa itu koneksi "close" tidak
+            # pernah menerima EOF selama worker hidup)
+            await asyncio.get_running_loop().run_in_executor(self.pool, os.getpid)
+        if unix_path:
+            server = await asyncio.start_unix_server(self._handle, unix_path,
+                                                     limit=MAX_HEADER_BYTES)
+        else:
+            server = await asyncio.start_server(self._handle, host, port, limit=MAX_HEADER_BYTES)
+        self.servers.append(server)
+        return server
+
+    async def close(self):
+        """Menutup semua listener lalu menghentikan pool proses."""
+        for server in self.servers:
+            server.close()
+            await server.wait_closed()
+        self.servers = []
+        if self.pool is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.pool.shutdown)
+            self.pool = None
+
+    async def _handle(self, reader, writer):
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    request = await _read_request(reader, writer)
+                except _HttpError as e:
+                    await self._send(writer, _error_response(e.status, e), False)
+                    break
+                if request is None:
+                    break
+                keep_alive = await self._dispatch(request, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _admit(self):
+        if self.slots.locked() and self.metrics.queued >= self.max_queue:
+            raise _HttpError(503, "Server sedang penuh, coba lagi nanti.")
+        start = time.perf_counter()
+        self.metrics.queued += 1
+        try:
+            await self.slots.acquire()
+        finally:
+            self.metrics.queued -= 1
+        self.metrics.in_flight += 1
+        self.metrics.observe("queue_wait", time.perf_counter() - start)
+
+    def _release(self):
+        self.metrics.in_flight -= 1
+        self.slots.release()
+
+    async def _dispatch(self, request, writer):
+        start = time.perf_counter()
+        self.metrics.add("requests")
+        admitted = False
+        response = None
+        try:
+            try:
+                route = self.routes.get(request.path)
+                if route is None:
+                    raise _HttpError(404, f"Endpoint tidak dikenal: {request.path}")
+                method, handler, limited = route
+                if request.method != method:
+                    raise _HttpError(405, f"Gunakan {method} untuk {request.path}.")
+                if limited:
+                    await self._admit()
+                    admitted = True
+                response = await handler(request)
+            except _HttpError as e:
+                if e.status == 503:
+                    self.metrics.add("rejected")
+                response = _error_response(e.status, e)
+            except StegoError as e:
+                response = _error_response(422, e)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                raise
+            except (ValueError, UnicodeDecodeError) as e:
+                response = _error_response(400, e)
+            except Exception:
+                # Detail kesalahan internal (termasuk path) tidak dikirim ke klien
+                response = _json_response(500, {"error": "Kesalahan internal server.",
+                                                "type": "InternalError"})
+            keep_alive = request.keep_alive and request.body_done
+            await self._send(writer, response, keep_alive)
+        finally:
+            if response is not None and response.file_path:
+                os.remove(response.file_path)
+            if admitted:
+                self._release()
+        self.metrics.add("completed" if response.status < 400 else "failed")
+        if route is not None and route[2]:
+            self.metrics.observe(request.path.strip("/"), time.perf_counter() - start)
+        return keep_alive
+
+    async def _send(self, writer, response, keep_alive):
+        length = (os.path.getsize(response.file_path) if response.file_path
+                  else len(response.body))
+        head = [f"HTTP/1.1 {response.status} {REASONS[response.status]}",
+                f"Content-Type: {response.content_type}",
+                f"Content-Length: {length}",
+                f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        head += [f"{name}: {value}" for name, value in response.headers.items()]
+        if response.status == 503:
+            head.append("Retry-After: 1")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+        if response.file_path:
+            with open(response.file_path, "rb") as f:
+                while chunk := f.read(CHUNK_BYTES):
+                    writer.write(chunk)
+                    await writer.drain()
+        else:
+            writer.write(response.body)
+        await writer.drain()
+
+    async def _spool(self, request, prefix_bytes=0):
+        """Menulis body ke file sementara; ``prefix_bytes`` pertama dikembalikan terpisah."""
+        fd, path = tempfile.mkstemp(prefix="lsbstego-", dir=self.spool_dir)
+        prefix = bytearray()
+        total = 0
+        try:
+            with os.fdopen(fd, "wb") as f:
+                async for chunk in request.body():
+                    total += len(chunk)
+                    if total > self.max_body:
+                        raise _HttpError(413, f"Body melebihi batas {self.max_body} byte.")
+                    if len(prefix) < prefix_bytes:
+                        take = prefix_bytes - len(prefix)
+                        prefix += chunk[:take]
+                        chunk = chunk[take:]
+                    f.write(chunk)
+            if len(prefix) < prefix_bytes:
+                raise _HttpError(400, "Body lebih pendek dari X-Payload-Length.")
+        except BaseException:
+            os.remove(path)
+            raise
+        return path, bytes(prefix)
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        self.metrics.pool_pending += 1
+        try:
+            return await loop.run_in_executor(self.pool, func, *args)
+        finally:
+            self.metrics.pool_pending -= 1
+            self.metrics.observe("process", time.perf_counter() - start)
+
+    async def _encode(self, request):
+        options, png_options = encode_options(request.query)
+        payload_length = _int(request.headers, "x-payload-length", None, 0)
+        if payload_length is None and "message" not in request.query:
+            raise _HttpError(400, "Kirim pesan lewat query 'message' atau header X-Payload-Length.")
+        input_path, prefix = await self._spool(request, payload_length or 0)
+        output_path = input_path + ".png"
+        try:
+            if payload_length is None:
+                message = request.query["message"]
+            else:
+                message = prefix if _flag(request.query, "binary") else prefix.decode("utf-8")
+            await self._run(_encode_job, input_path, output_path, message, options, png_options)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(output_path)
+            raise
+        finally:
+            os.remove(input_path)
+        return _Response(200, content_type="image/png", file_path=output_path)
+
+    async def _decode(self, request):
+        input_path, _ = await self._spool(request)
+        try:
+            message = await self._run(_decode_job, input_path)
+        finally:
+            os.remove(input_path)
+        if isinstance(message, bytes):
+            return _Response(200, message, "application/octet-stream",
+                             headers={"X-Payload-Type": "binary"})
+        return _Response(200, message.encode("utf-8"), "text/plain; charset=utf-8",
+                         headers={"X-Payload-Type": "text"})
+
+    async def _metrics(self, request):
+        data = self.metrics.to_dict()
+        data["limits"] = {"workers": self.workers, "max_in_flight": self.max_in_flight,
+                          "max_queue": self.max_queue, "max_body": self.max_body}
+        return _json_response(200, data)
+
+    async def _health(self, request):
+        return _json_response(200, {"status": "ok"})
+
+
+async def serve(host="127.0.0.1", port=8080, unix_path=None, ready=None, **options):
+    """Menjalankan :class:`StegoServer` sampai dibatalkan.
+
+    ``options`` diteruskan ke konstruktor server; ``ready`` (opsional)
+    dipanggil dengan daftar alamat yang didengarkan setelah server siap.
+    """
+    server = StegoServer(**options)
+    try:
+        listener = await server.start(host, port, unix_path)
+        if ready is not None:
+            ready([sock.getsockname() for sock in listener.sockets])
+        await listener.serve_forever()
+    finally:
+        await server.close()
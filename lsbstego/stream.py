@@ -0,0 +1,285 @@
+"""Codec streaming per strip baris untuk gambar berukuran sangat besar.
+
+Gambar dibaca dan ditulis per strip sehingga memori puncak hanya sebesar
+beberapa strip, bukan dua salinan RGB penuh. PNG non-interlaced 8-bit
+di-decode secara streaming; format lain di-decode sekali ke mode aslinya
+lalu dikonversi ke RGB per strip.
+"""
+
+import io
+import os
+import struct
+import zlib
+
+import numpy as np
+from PIL import Image
+
+from .codec import decode_chunks, embed_bits, payload_bits
+from .errors import MessageTooLargeError
+from .payload import capacity_bits
+from .pngout import PNG_SIGNATURE, DeflateStream, fast_settings, filter_rows, png_chunk
+from .preview import StripThumbnail
+from .profiling import NULL_METRICS
+
+STRIP_BYTES = 8 << 20
+
+# Jumlah sampel per piksel untuk tiap color type PNG
+_PNG_SAMPLES = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+
+def strip_rows_for(width, rows=None):
+    """Jumlah baris per strip; default sekitar 8 MB data RGB per strip."""
+    if rows:
+        return rows
+    return max(1, STRIP_BYTES // max(1, width * 3))
+
+
+def _read_chunk(fp):
+    head = fp.read(8)
+    if len(head) < 8:
+        raise ValueError("File PNG terpotong.")
+    length, ctype = struct.unpack(">I4s", head)
+    data = fp.read(length)
+    fp.read(4)  # CRC
+    return ctype, data
+
+
+class PngStripReader:
+    """Membaca PNG per strip tanpa men-decode seluruh frame.
+
+    Data IDAT di-inflate bertahap; tiap strip dibungkus ulang menjadi PNG kecil
+    (tanpa kompresi) yang di-decode oleh Pillow, dengan baris terakhir strip
+    sebelumnya disertakan sebagai referensi filter.
+    """
+
+    def __init__(self, path):
+        self.fp = open(path, "rb")
+        if self.fp.read(8) != PNG_SIGNATURE:
+            self.fp.close()
+            raise ValueError("Bukan file PNG.")
+        ctype, ihdr = _read_chunk(self.fp)
+        (self.width, self.height, self.bit_depth, self.color_type,
+         _, _, self.interlace) = struct.unpack(">IIBBBBB", ihdr)
+        self.extra = []
+        self.pending = b""
+        while True:
+            ctype, data = _read_chunk(self.fp)
+            if ctype == b"IDAT":
+                self.pending = data
+                break
+            if ctype in (b"PLTE", b"tRNS"):
+                self.extra.append(png_chunk(ctype, data))
+            if ctype == b"IEND":
+                raise ValueError("PNG tidak memiliki data IDAT.")
+        self.stride = self.width * _PNG_SAMPLES[self.color_type]
+        self.inflater = zlib.decompressobj()
+        self.previous = None
+
+    @classmethod
+    def supports(cls, path):
+        """PNG non-interlaced 8-bit per sampel bisa dibaca secara streaming."""
+        with open(path, "rb") as fp:
+            if fp.read(8) != PNG_SIGNATURE:
+                return False
+            ctype, ihdr = _read_chunk(fp)
+        _, _, depth, color, _, _, interlace = struct.unpack(">IIBBBBB", ihdr)
+        return ctype == b"IHDR" and depth == 8 and interlace == 0 and color in _PNG_SAMPLES
+
+    def _inflate(self, size):
+        out = bytearray()
+        while len(out) < size:
+            if not self.pending:
+                ctype, data = _read_chunk(self.fp)
+                if ctype != b"IDAT":
+                    raise ValueError("Data IDAT PNG terpotong.")
+                self.pending = data
+            out += self.inflater.decompress(self.pending, size - len(out))
+            self.pending = self.inflater.unconsumed_tail
+        return bytes(out)
+
+    def read_rows(self, rows):
+        """Men-decode ``rows`` baris berikutnya dan mengembalikan array RGB."""
+        raw = self._inflate(rows * (self.stride + 1))
+        has_reference = self.previous is not None
+        if has_reference:
+            raw = b"\x00" + self.previous + raw
+        total = rows + has_reference
+        ihdr = struct.pack(">IIBBBBB", self.width, total, 8, self.color_type, 0, 0, 0)
+        mini = (PNG_SIGNATURE + png_chunk(b"IHDR", ihdr) + b"".join(self.extra)
+                + png_chunk(b"IDAT", zlib.compress(raw, 0)) + png_chunk(b"IEND", b""))
+        img = Image.open(io.BytesIO(mini))
+        img.load()
+        native = np.asarray(img)
+        self.previous = native[-1].tobytes()
+        if has_reference:
+            img = img.crop((0, 1, self.width, total))
+        return np.asarray(img.convert("RGB"))
+
+    def close(self):
+        self.fp.close()
+
+
+def iter_strips(path, rows=None):
+    """Mengembalikan (ukuran, generator strip RGB) untuk sebuah gambar."""
+    if PngStripReader.supports(path):
+        reader = PngStripReader(path)
+        size = (reader.width, reader.height)
+        rows = strip_rows_for(reader.width, rows)
+
+        def generate():
+            try:
+                for y in range(0, reader.height, rows):
+                    yield reader.read_rows(min(rows, reader.height - y))
+            finally:
+                reader.close()
+        return size, generate()
+
+    img = Image.open(path)
+    rows = strip_rows_for(img.width, rows)
+
+    def generate():
+        # Decode sekali dalam mode asli, konversi RGB hanya per strip
+        img.load()
+        for y in range(0, img.height, rows):
+            yield np.asarray(img.crop((0, y, img.width, min(y + rows, img.height))).convert("RGB"))
+    return img.size, generate()
+
+
+class PngStripWriter:
+    """Menulis PNG RGB 8-bit per strip dengan filter dan kompresi bertahap.
+
+    ``strategy``, ``filter_type``, dan ``threads`` sama seperti pada
+    :func:`lsbstego.pngout.write_png`; defaultnya filter Up satu thread.
+    """
+
+    def __init__(self, path, width, height, compress_level=6, strategy="default",
+                 filter_type="up", threads=1):
+        self.fp = open(path, "wb")
+        self.filter_type = filter_type
+        self.deflater = DeflateStream(compress_level, strategy, threads)
+        self.previous = None
+        ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+        self.fp.write(PNG_SIGNATURE + png_chunk(b"IHDR", ihdr))
+
+    def write_rows(self, strip):
+        """Memfilter dan mengompres satu strip RGB (H, W, 3)."""
+        rows = strip.reshape(len(strip), -1)
+        filtered = filter_rows(rows, self.previous, 3, self.filter_type)
+        self.previous = rows[-1].copy()
+        data = self.deflater.compress(filtered.data)
+        if data:
+            self.fp.write(png_chunk(b"IDAT", data))
+
+    def close(self):
+        self.fp.write(png_chunk(b"IDAT", self.deflater.flush()) + png_chunk(b"IEND", b""))
+        self.fp.close()
+
+    def abort(self):
+        """Menutup file tanpa menyelesaikan PNG (dipakai saat proses gagal)."""
+        self.deflater.close()
+        self.fp.close()
+
+
+def _lsb_chunks(strips):
+    pending = np.empty(0, dtype=np.uint8)
+    for strip in strips:
+        bits = np.bitwise_and(strip, 1).reshape(-1)
+        if len(pending):
+            bits = np.concatenate((pending, bits))
+        usable = len(bits) - len(bits) % 8
+        pending = bits[usable:]
+        yield np.packbits(bits[:usable]).tobytes()
+
+
+def _with_progress(strips, height, progress):
+    """Memanggil ``progress(baris_selesai, total_baris)`` setiap satu strip selesai diproses."""
+    done = 0
+    for strip in strips:
+        yield strip
+        done += len(strip)
+        progress(done, height)
+
+
+def encode_stream(image_path, output_path, secret_message, legacy=False, rows=None,
+                  compress_level=6, progress=None, compression=None, level=None, metrics=None,
+                  strategy="default", filter_type=None, optimize=False, threads=1, preview=None,
+                  ecc=None):
+    """Menyisipkan pesan dan menulis hasil sebagai PNG, strip demi strip.
+
+    ``compress_level``, ``strategy``, ``filter_type``, ``optimize``, dan
+    ``threads`` mengatur PNG output seperti pada
+    :func:`lsbstego.pngout.save_image`, sedangkan ``compression`` dan
+    ``level`` mengatur kompresi payload, dan ``ecc`` koreksi galat, seperti
+    pada ``encode_image``.
+    ``progress`` (opsional) dipanggil dengan ``(baris_selesai, total_baris)``
+    setelah tiap strip; exception dari callback menghentikan proses dan file
+    output yang belum lengkap dihapus.
+
+    PNG ditulis ke file sementara di direktori ``output_path`` lalu
+    dipindahkan dengan ``os.replace`` setelah selesai, jadi ``output_path``
+    boleh sama dengan ``image_path`` dan file lama tidak tersentuh bila gagal.
+
+    Jika ``preview`` berisi ukuran maksimum (lebar, tinggi), thumbnail hasil
+    encode disusun dari strip yang ditulis dan dikembalikan sebagai gambar
+    Pillow, sehingga pemanggil tidak perlu membaca ulang file output.
+    """
+    metrics = metrics or NULL_METRICS
+    with metrics.stage("open"):
+        (width, height), strips = iter_strips(image_path, rows)
+    with metrics.stage("payload"):
+        bits = payload_bits(secret_message, legacy, compression=compression, level=level,
+                            ecc=ecc)
+    if len(bits) > capacity_bits(width, height):
+        strips.close()
+        raise MessageTooLargeError("Ukuran pesan terlalu besar untuk gambar ini!")
+    source = _with_progress(strips, height, progress) if progress else strips
+    source = metrics.timed_iter("read", source)
+    compress_level, filter_type = fast_settings(compress_level, filter_type, optimize)
+    partial = f"{output_path}.{os.getpid()}.part"
+    writer = PngStripWriter(partial, width, height, compress_level, strategy, filter_type,
+                            threads)
+    thumbnail = StripThumbnail(width, height, preview) if preview else None
+    try:
+        offset = 0
+        for strip in source:
+            metrics.add("strips")
+            metrics.add("bytes_allocated", strip.nbytes)
+            if offset < len(bits):
+                with metrics.stage("embed"):
+                    strip = np.array(strip)
+                    embed_bits(strip.reshape(-1), bits[offset:offset + strip.size])
+                metrics.add("pixels_touched", -(-min(strip.size, len(bits) - offset) // 3))
+            offset += strip.size
+            with metrics.stage("write"):
+                writer.write_rows(strip)
+            if thumbnail is not None:
+                with metrics.stage("preview"):
+                    thumbnail.add(strip)
+        with metrics.stage("write"):
+            writer.close()
+    except BaseException:
+        strips.close()
+        writer.abort()
+        os.remove(partial)
+        raise
+    strips.close()
+    os.replace(partial, output_path)
+    if thumbnail is not None:
+        with metrics.stage("preview"):
+            return thumbnail.image()
+
+
+def decode_stream(image_path, rows=None, progress=None, metrics=None):
+    """Mengekstrak pesan dengan hanya membaca strip yang memuat payload.
+
+    ``progress`` dan ``metrics`` sama seperti pada :func:`encode_stream`;
+    tahap ``extract`` di sini sudah termasuk decode strip.
+    """
+    metrics = metrics or NULL_METRICS
+    with metrics.stage("open"):
+        (width, height), strips = iter_strips(image_path, rows)
+    source = _with_progress(strips, height, progress) if progress else strips
+    try:
+        return decode_chunks(_lsb_chunks(source), width * height * 3 // 8, metrics=metrics)
+    finally:
+        strips.close()
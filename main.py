@@ -1,77 +1,38 @@
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
-from PIL import Image
 import os
 
-# --- BAGIAN LOGIKA STEGANOGRAFI LSB ---
-
-def char_to_binary(chars):
-    """Mengubah string menjadi representasi biner."""
-    return ''.join(format(ord(i), '08b') for i in chars)
-
-def binary_to_char(binary):
-    """Mengubah representasi biner kembali menjadi string."""
-    chars = ""
-    for i in range(0, len(binary), 8):
-        byte = binary[i:i+8]
-        if len(byte) == 8:
-            chars += chr(int(byte, 2))
-    return chars
-
-def encode_image(image_path, secret_message):
-    """Menyisipkan pesan rahasia ke dalam gambar."""
-    try:
-        img = Image.open(image_path, 'r').convert("RGB")
-        width, height = img.size
-        secret_message += "#####" 
-        binary_secret_message = char_to_binary(secret_message)
-        data_len = len(binary_secret_message)
-        if data_len > width * height * 3:
-            messagebox.showerror("Error", "Ukuran pesan terlalu besar untuk gambar ini!")
-            return None
-        data_index = 0
-        new_img = img.copy()
-        for y in range(height):
-            for x in range(width):
-                pixel = list(img.getpixel((x, y)))
-                for i in range(3):
-                    if data_index < data_len:
-                        pixel[i] = int(format(pixel[i], '08b')[:-1] + binary_secret_message[data_index], 2)
-                        data_index += 1
-                new_img.putpixel((x, y), tuple(pixel))
-                if data_index >= data_len:
-                    return new_img 
-        return new_img
-    except FileNotFoundError:
-        messagebox.showerror("Error", "File gambar tidak ditemukan.")
-        return None
-    except Exception as e:
-        messagebox.showerror("Error", f"Terjadi kesalahan saat encoding: {e}")
-        return None
-
-def decode_image(image_path):
-    """Mengekstrak pesan rahasia dari gambar."""
+from lsbstego import (MessageTooLargeError, NoMessageError, PayloadError, decode_file,
+                      decode_frames, decode_stream, encode_stream)
+from lsbstego.jobs import JobRunner
+from lsbstego.preview import PREVIEW_SIZE, LRUCache, cached_thumbnail, file_key, image_nbytes
+from lsbstego.rawmap import is_gray_pnm
+
+# Jumlah baris per strip untuk pekerjaan GUI: menentukan seberapa sering
+# progres dilaporkan dan seberapa cepat tombol Batal berlaku
+JOB_STRIP_ROWS = 128
+JOB_POLL_MS = 100
+# Kompresi IDAT PNG hasil encode dibagi ke semua CPU (0 = semua CPU)
+JOB_PNG_THREADS = 0
+# Anggaran memori cache preview (thumbnail + CTkImage), dibuang LRU jika penuh
+PREVIEW_CACHE_BYTES = 64 << 20
+
+
+def decode_any(image_path, rows=None, progress=None):
+    """Decode per strip (progres + bisa dibatalkan), dengan jalur lain untuk format khusus
+
+    PGM langsung dibaca dengan decode_file; payload mode k-bit/alpha ditolak
+    jalur strip dengan PayloadError lalu dibaca ulang dengan decode_file, dan
+    payload multi-frame (indeks LSBF di frame pertama) dengan decode_frames.
+    """
+    if is_gray_pnm(image_path):
+        return decode_file(image_path)
     try:
-        img = Image.open(image_path, 'r')
-        width, height = img.size
-        binary_data = ""
-        delimiter = "#####"
-        for y in range(height):
-            for x in range(width):
-                pixel = img.getpixel((x, y))
-                for i in range(3):
-                    binary_data += format(pixel[i], '08b')[-1]
-                    if len(binary_data) % 8 == 0:
-                        decoded_chars = binary_to_char(binary_data)
-                        if decoded_chars.endswith(delimiter):
-                            return decoded_chars[:-len(delimiter)]
-        return "Tidak ada pesan tersembunyi yang ditemukan atau delimiter rusak."
-    except FileNotFoundError:
-        messagebox.showerror("Error", "File gambar tidak ditemukan.")
-        return None
-    except Exception as e:
-        messagebox.showerror("Error", f"Terjadi kesalahan saat decoding: {e}")
-        return None
+        return decode_stream(image_path, rows=rows, progress=progress)
+    except PayloadError:
+        return decode_file(image_path)
+    except NoMessageError:
+        return decode_frames(image_path)
 
 # --- BAGIAN INTERFACE (GUI) ---
 
@@ -90,6 +51,14 @@ class App(ctk.CTk):
 
         self.encode_image_path = None
         self.decode_image_path = None
+
+        # Encode/decode berjalan di thread latar belakang agar window tetap responsif
+        self.jobs = JobRunner()
+        self.encode_jobs = []
+        self.decode_jobs = []
+
+        # Preview per (path, mtime, ukuran) agar file yang sama tidak di-decode ulang
+        self.previews = LRUCache(PREVIEW_CACHE_BYTES)
         
         # Konfigurasi grid utama
         self.grid_rowconfigure(1, weight=1)
@@ -104,6 +73,8 @@ class App(ctk.CTk):
         # Footer
         self.create_footer()
 
+        self.after(JOB_POLL_MS, self.poll_jobs)
+
     def create_header(self):
         """Membuat header"""
         self.header_frame = ctk.CTkFrame(self, height=80, corner_radius=0, 
@@ -217,8 +188,12 @@ class App(ctk.CTk):
         self.secret_entry.grid(row=1, column=0, padx=15, pady=(5, 15), sticky="ew")
 
         # Step 3: Process
+        encode_action_frame = ctk.CTkFrame(encode_tab, fg_color="transparent")
+        encode_action_frame.grid(row=3, column=0, padx=20, pady=15, sticky="ew")
+        encode_action_frame.grid_columnconfigure((0, 1), weight=1)
+
         self.btn_encode = ctk.CTkButton(
-            encode_tab,
+            encode_action_frame,
             text="🚀 Proses Encode & Simpan",
             command=self.encode_message,
             height=50,
@@ -227,7 +202,10 @@ class App(ctk.CTk):
             fg_color=["#2d7d32", "#1b5e20"],
             hover_color=["#388e3c", "#2e7d32"]
         )
-        self.btn_encode.grid(row=3, column=0, padx=20, pady=15)
+        self.btn_encode.grid(row=0, column=0, padx=10, pady=(0, 10), sticky="e")
+
+        self.btn_cancel_encode, self.encode_progress, self.encode_status_label = \
+            self.create_job_controls(encode_action_frame, self.cancel_encode)
 
     def create_encode_preview_area(self, parent):
         """Membuat area preview gambar untuk encode"""
@@ -352,8 +330,12 @@ class App(ctk.CTk):
         self.decode_image_panel.grid(row=1, column=0, padx=5, pady=5, sticky="ew")
 
         # Step 2: Decode button
+        decode_action_frame = ctk.CTkFrame(decode_tab, fg_color="transparent")
+        decode_action_frame.grid(row=2, column=0, padx=20, pady=15, sticky="ew")
+        decode_action_frame.grid_columnconfigure((0, 1), weight=1)
+
         self.btn_decode = ctk.CTkButton(
-            decode_tab,
+            decode_action_frame,
             text="🔍 Proses Decode",
             command=self.decode_message,
             height=50,
@@ -362,7 +344,10 @@ class App(ctk.CTk):
             fg_color=["#f57c00", "#e65100"],
             hover_color=["#ff9800", "#ef6c00"]
         )
-        self.btn_decode.grid(row=2, column=0, padx=20, pady=15)
+        self.btn_decode.grid(row=0, column=0, padx=10, pady=(0, 10), sticky="e")
+
+        self.btn_cancel_decode, self.decode_progress, self.decode_status_label = \
+            self.create_job_controls(decode_action_frame, self.cancel_decode)
 
         # Result area
         result_frame = ctk.CTkFrame(decode_tab, corner_radius=10)
@@ -385,6 +370,34 @@ class App(ctk.CTk):
         )
         self.decoded_message_text.grid(row=1, column=0, padx=15, pady=(5, 15), sticky="ew")
 
+    def create_job_controls(self, parent, cancel_command):
+        """Membuat tombol batal, progress bar, dan label status pekerjaan"""
+        btn_cancel = ctk.CTkButton(
+            parent,
+            text="⛔ Batal",
+            command=cancel_command,
+            height=50,
+            corner_radius=12,
+            font=ctk.CTkFont(size=16, weight="bold"),
+            fg_color=["#757575", "#424242"],
+            hover_color=["#9e9e9e", "#616161"],
+            state="disabled"
+        )
+        btn_cancel.grid(row=0, column=1, padx=10, pady=(0, 10), sticky="w")
+
+        progress = ctk.CTkProgressBar(parent, height=12, corner_radius=6)
+        progress.grid(row=1, column=0, columnspan=2, padx=10, pady=5, sticky="ew")
+        progress.set(0)
+
+        status_label = ctk.CTkLabel(
+            parent,
+            text="",
+            font=ctk.CTkFont(size=13),
+            text_color=["#666666", "#cccccc"]
+        )
+        status_label.grid(row=2, column=0, columnspan=2, padx=10, pady=(0, 5))
+        return btn_cancel, progress, status_label
+
     def create_footer(self):
         """Membuat footer"""
         self.footer_frame = ctk.CTkFrame(self, height=40, corner_radius=0,
@@ -426,18 +439,18 @@ class App(ctk.CTk):
             self.decoded_message_text.insert("1.0", "Klik 'Proses Decode' untuk melihat pesan")
             self.decoded_message_text.configure(state="disabled")
 
-    def display_image(self, path, panel):
-        """Menampilkan gambar dengan ukuran yang sesuai"""
+    def display_image(self, path, panel, thumbnail=None):
+        """Menampilkan preview gambar (dari cache jika file belum berubah)"""
         try:
-            img = Image.open(path)
-            
-            # Resize image untuk preview
-            max_size = (300, 300)
-            img.thumbnail(max_size, Image.Resampling.LANCZOS)
-            
-            # Buat CTkImage
-            ctk_img = ctk.CTkImage(light_image=img, dark_image=img, 
-                                  size=(img.width, img.height))
+            key = file_key(path)
+            ctk_img = self.previews.get(key)
+            if ctk_img is None:
+                # Thumbnail dari encoder dipakai langsung tanpa membaca ulang file
+                img = cached_thumbnail(self.previews, path, PREVIEW_SIZE, thumbnail)
+                ctk_img = ctk.CTkImage(light_image=img, dark_image=img,
+                                      size=(img.width, img.height))
+                # Gambar PIL sudah dihitung di entri thumbnail; ini PhotoImage hasil scaling Tk
+                self.previews.put(key, ctk_img, image_nbytes(img))
             panel.configure(image=ctk_img, text="")
             panel.image = ctk_img
             
@@ -456,28 +469,35 @@ class App(ctk.CTk):
             messagebox.showwarning("⚠️ Peringatan", "Pesan rahasia tidak boleh kosong!")
             return
         
-        # Show progress
-        self.btn_encode.configure(text="🔄 Processing...", state="disabled")
-        self.update()
-        
-        new_img_obj = encode_image(self.encode_image_path, secret)
-        
-        if new_img_obj:
-            filename = os.path.splitext(os.path.basename(self.encode_image_path))[0]
-            save_path = filedialog.asksaveasfilename(
-                defaultextension=".png",
-                filetypes=[("PNG file", "*.png")],
-                initialfile=f"{filename}_encoded.png",
-                title="💾 Simpan Gambar Hasil Encode"
-            )
-            
-            if save_path:
-                new_img_obj.save(save_path)
-                self.display_image(save_path, self.after_image_panel)
-                messagebox.showinfo("✅ Berhasil!", 
-                                  f"Pesan berhasil disembunyikan!\n\nFile disimpan di:\n{save_path}")
-        
-        self.btn_encode.configure(text="🚀 Proses Encode & Simpan", state="normal")
+        filename = os.path.splitext(os.path.basename(self.encode_image_path))[0]
+        save_path = filedialog.asksaveasfilename(
+            defaultextension=".png",
+            filetypes=[("PNG file", "*.png")],
+            initialfile=f"{filename}_encoded.png",
+            title="💾 Simpan Gambar Hasil Encode"
+        )
+        if not save_path:
+            return
+        # encode_stream menulis ke file sementara lalu menggantinya, jadi menimpa
+        # gambar asli aman; tetap minta konfirmasi karena aslinya akan hilang
+        if os.path.abspath(save_path) == os.path.abspath(self.encode_image_path) and \
+                not messagebox.askyesno("⚠️ Peringatan",
+                                        "File tujuan sama dengan gambar asli. Timpa gambar asli?"):
+            return
+
+        # Jalankan di thread latar belakang; hasil ditangani di on_encode_*
+        job = self.jobs.submit(
+            encode_stream, self.encode_image_path, save_path, secret,
+            rows=JOB_STRIP_ROWS, threads=JOB_PNG_THREADS, preview=PREVIEW_SIZE,
+            label=os.path.basename(self.encode_image_path),
+            on_progress=self.on_job_progress,
+            on_done=self.on_encode_done,
+            on_error=self.on_encode_error,
+            on_cancel=self.on_job_cancelled
+        )
+        job.output_path = save_path
+        self.encode_jobs.append(job)
+        self.update_job_status()
 
     def decode_message(self):
         """Proses decoding pesan"""
@@ -485,16 +505,109 @@ class App(ctk.CTk):
             messagebox.showwarning("⚠️ Peringatan", "Silakan pilih gambar yang ingin di-decode!")
             return
         
-        # Show progress
-        self.btn_decode.configure(text="🔄 Processing...", state="disabled")
-        self.update()
-        
-        hidden_message = decode_image(self.decode_image_path)
-        
+        job = self.jobs.submit(
+            decode_any, self.decode_image_path,
+            rows=JOB_STRIP_ROWS,
+            label=os.path.basename(self.decode_image_path),
+            on_progress=self.on_job_progress,
+            on_done=self.on_decode_done,
+            on_error=self.on_decode_error,
+            on_cancel=self.on_job_cancelled
+        )
+        self.decode_jobs.append(job)
+        self.update_job_status()
+
+    def cancel_encode(self):
+        """Batalkan semua pekerjaan encode yang berjalan dan yang masih antre"""
+        for job in self.encode_jobs:
+            job.cancel()
+
+    def cancel_decode(self):
+        """Batalkan semua pekerjaan decode yang berjalan dan yang masih antre"""
+        for job in self.decode_jobs:
+            job.cancel()
+
+    def poll_jobs(self):
+        """Ambil event dari worker (progres/hasil) secara berkala di thread Tk"""
+        self.jobs.poll()
+        self.after(JOB_POLL_MS, self.poll_jobs)
+
+    def job_widgets(self, job):
+        """Progress bar dan label status milik tab pekerjaan tersebut"""
+        if job in self.encode_jobs:
+            return self.encode_progress, self.encode_status_label
+        return self.decode_progress, self.decode_status_label
+
+    def finish_job(self, job, status_text):
+        """Keluarkan pekerjaan dari daftar tab dan perbarui status"""
+        progress, status_label = self.job_widgets(job)
+        for jobs in (self.encode_jobs, self.decode_jobs):
+            if job in jobs:
+                jobs.remove(job)
+        progress.set(0)
+        status_label.configure(text=status_text)
+        self.update_job_status()
+
+    def update_job_status(self):
+        """Perbarui tombol batal dan jumlah antrean tiap tab"""
+        for jobs, btn_cancel, btn, text in (
+            (self.encode_jobs, self.btn_cancel_encode, self.btn_encode, "🚀 Proses Encode & Simpan"),
+            (self.decode_jobs, self.btn_cancel_decode, self.btn_decode, "🔍 Proses Decode"),
+        ):
+            btn_cancel.configure(state="normal" if jobs else "disabled")
+            btn.configure(text=f"{text} ({len(jobs)} antre)" if jobs else text)
+
+    def on_job_progress(self, job, done, total):
+        """Perbarui progress bar dari laporan worker"""
+        progress, status_label = self.job_widgets(job)
+        progress.set(done / total if total else 0)
+        status_label.configure(text=f"🔄 Processing {job.label}... {done * 100 // max(total, 1)}%")
+
+    def on_job_cancelled(self, job, _):
+        """Pekerjaan dibatalkan oleh pengguna"""
+        self.finish_job(job, f"⛔ {job.label} dibatalkan")
+
+    def on_encode_done(self, job, thumbnail):
+        """Encode selesai: tampilkan hasil"""
+        self.finish_job(job, f"✅ {job.label} selesai")
+        self.display_image(job.output_path, self.after_image_panel, thumbnail)
+        messagebox.showinfo("✅ Berhasil!", 
+                          f"Pesan berhasil disembunyikan!\n\nFile disimpan di:\n{job.output_path}")
+
+    def on_encode_error(self, job, error):
+        """Encode gagal: tampilkan pesan error yang sesuai"""
+        self.finish_job(job, f"❌ {job.label} gagal")
+        if isinstance(error, FileNotFoundError):
+            messagebox.showerror("Error", "File gambar tidak ditemukan.")
+        elif isinstance(error, MessageTooLargeError):
+            messagebox.showerror("Error", "Ukuran pesan terlalu besar untuk gambar ini!")
+        else:
+            messagebox.showerror("Error", f"Terjadi kesalahan saat encoding: {error}")
+
+    def on_decode_done(self, job, hidden_message):
+        """Decode selesai: tampilkan pesan yang ditemukan"""
+        self.finish_job(job, f"✅ {job.label} selesai")
+        self.show_decoded_message(hidden_message)
+
+    def on_decode_error(self, job, error):
+        """Decode gagal atau tidak ada pesan"""
+        self.finish_job(job, f"❌ {job.label} selesai tanpa pesan")
+        if isinstance(error, FileNotFoundError):
+            messagebox.showerror("Error", "File gambar tidak ditemukan.")
+        elif not isinstance(error, NoMessageError):
+            messagebox.showerror("Error", f"Terjadi kesalahan saat decoding: {error}")
+        self.show_decoded_message(None)
+
+    def show_decoded_message(self, hidden_message):
+        """Tampilkan hasil decode di text area"""
         self.decoded_message_text.configure(state="normal")
         self.decoded_message_text.delete("1.0", "end")
         
-        if hidden_message and hidden_message != "Tidak ada pesan tersembunyi yang ditemukan atau delimiter rusak.":
+        if isinstance(hidden_message, bytes):
+            # Payload biner (mis. file) ditampilkan sebagai teks sebisanya
+            hidden_message = hidden_message.decode("utf-8", errors="replace")
+
+        if hidden_message:
             self.decoded_message_text.insert("1.0", hidden_message)
             messagebox.showinfo("✅ Pesan Ditemukan!", 
                               f"Pesan berhasil diekstrak!\n\nPanjang pesan: {len(hidden_message)} karakter")
@@ -504,7 +617,6 @@ class App(ctk.CTk):
                                  "Tidak ada pesan tersembunyi yang ditemukan atau gambar tidak menggunakan metode LSB.")
         
         self.decoded_message_text.configure(state="disabled")
-        self.btn_decode.configure(text="🔍 Proses Decode", state="normal")
 
 if __name__ == "__main__":
     app = App()
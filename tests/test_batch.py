@@ -0,0 +1,21 @@
+"""Uji pemrosesan batch."""
+
+import numpy as np
+from PIL import Image
+
+from lsbstego import decode_batch, encode_batch
+
+
+def test_encode_batch_mirrors_dirs_and_reports_clashes(tmp_path):
+    pixels = np.random.default_rng(5).integers(0, 256, (32, 32, 3), dtype=np.uint8)
+    inputs = []
+    for name in ("d1/a.png", "d2/a.png", "d2/a.bmp"):
+        path = tmp_path / "src" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        Image.fromarray(pixels).save(path)
+        inputs.append(str(path))
+    results = encode_batch(inputs, "halo", str(tmp_path / "out"), workers=1)
+    assert [r["ok"] for r in results] == [True, True, False]
+    outputs = [r["output"] for r in results[:2]]
+    assert len(set(outputs)) == 2
+    assert [r["message"] for r in decode_batch(outputs, workers=1)] == ["halo", "halo"]
@@ -0,0 +1,39 @@
+"""Uji perkiraan kapasitas dari header gambar."""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from lsbstego import capacity_report, encode_image, payload_sizes, preflight
+
+
+def test_ecc_modes_match_encode(tmp_path):
+    path = tmp_path / "gambar.png"
+    Image.fromarray(np.zeros((40, 40, 3), dtype=np.uint8)).save(path)
+    sizes = payload_sizes("pesan kecil", ecc="rep3")
+    report = capacity_report(str(path), sizes, ecc="rep3")
+    for mode in report["modes"]:
+        if mode["name"] == "1bit":
+            assert all(mode["fits"].values())
+            encode_image(str(path), "pesan kecil", ecc="rep3")
+        else:
+            assert not any(mode["fits"].values())
+    with pytest.raises(ValueError):
+        encode_image(str(path), "pesan kecil", bits_per_channel=2, ecc="rep3")
+    with pytest.raises(ValueError):
+        preflight(str(path), "pesan kecil", bits_per_channel=2, ecc="rep3")
+
+
+def test_too_small_carrier_has_no_capacity(tmp_path):
+    path = tmp_path / "kecil.png"
+    Image.fromarray(np.zeros((3, 3, 3), dtype=np.uint8)).save(path)
+    report = capacity_report(str(path), payload_sizes(""))
+    for mode in report["modes"]:
+        assert mode["max_bytes"] is None
+        assert not any(mode["fits"].values())
+    assert preflight(str(path), "")["fits"] is False
+
+    # 7x7 RGB: 147 bit = 18 byte, sisa 4 byte setelah header
+    Image.fromarray(np.zeros((7, 7, 3), dtype=np.uint8)).save(path)
+    modes = {mode["name"]: mode for mode in capacity_report(str(path))["modes"]}
+    assert modes["1bit"]["max_bytes"] == 4
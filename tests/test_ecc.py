@@ -0,0 +1,38 @@
+"""Uji ketahanan payload ber-ECC terhadap bit yang terbalik."""
+
+import numpy as np
+import pytest
+
+from lsbstego import decode_pixels, encode_pixels
+from lsbstego.ecc import ECC_IDS, encoded_bits
+from lsbstego.payload import HEADER_SIZE
+
+MESSAGE = "pesan rahasia dengan ECC"
+
+
+def carrier(scheme):
+    rng = np.random.default_rng(7)
+    pixels = rng.integers(0, 256, (32, 32, 3), dtype=np.uint8)
+    encode_pixels(pixels, MESSAGE, ecc=scheme)
+    return pixels
+
+
+@pytest.mark.parametrize("scheme", list(ECC_IDS))
+def test_single_flip_in_header_is_corrected(scheme):
+    pixels = carrier(scheme)
+    flat = pixels.reshape(-1)
+    for bit in range(encoded_bits(HEADER_SIZE * 8, scheme)):
+        damaged = flat.copy()
+        damaged[bit] ^= 1
+        assert decode_pixels(damaged.reshape(pixels.shape)) == MESSAGE, bit
+
+
+@pytest.mark.parametrize("scheme", list(ECC_IDS))
+def test_single_flip_in_body_is_corrected(scheme):
+    pixels = carrier(scheme)
+    flat = pixels.reshape(-1)
+    start = encoded_bits(HEADER_SIZE * 8, scheme)
+    for bit in range(start, start + encoded_bits(len(MESSAGE) * 8, scheme), 5):
+        damaged = flat.copy()
+        damaged[bit] ^= 1
+        assert decode_pixels(damaged.reshape(pixels.shape)) == MESSAGE, bit
@@ -0,0 +1,47 @@
+"""Uji penyisipan per frame untuk GIF/APNG/TIFF."""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from lsbstego import decode_batch, decode_file, decode_frames, encode_frames
+
+
+def static_image(path):
+    rng = np.random.default_rng(3)
+    Image.fromarray(rng.integers(0, 256, (48, 64, 3), dtype=np.uint8)).save(path)
+
+
+@pytest.mark.parametrize("suffix", [".gif", ".png", ".tif"])
+def test_single_frame_round_trip(tmp_path, suffix):
+    source = tmp_path / "sumber.png"
+    output = tmp_path / f"hasil{suffix}"
+    static_image(source)
+    encode_frames(str(source), str(output), "pesan satu frame")
+    assert decode_frames(str(output)) == "pesan satu frame"
+    assert decode_file(str(output)) == "pesan satu frame"
+
+
+def test_batch_decode_reads_gif(tmp_path):
+    source = tmp_path / "sumber.png"
+    output = tmp_path / "hasil.gif"
+    static_image(source)
+    encode_frames(str(source), str(output), "pesan gif")
+    [result] = decode_batch([str(output)], workers=1)
+    assert result["ok"] and result["message"] == "pesan gif"
+    assert decode_file(str(output)) == "pesan gif"
+
+
+def test_transparent_gif_to_tiff_round_trip(tmp_path):
+    index = np.random.default_rng(6).integers(0, 128, (40, 40), dtype=np.uint8)
+    index[:10, :10] = 64
+    frames = []
+    for shift in range(2):
+        frame = Image.fromarray((index + shift) % 128, "P")
+        frame.putpalette([v for i in range(256) for v in (i, 255 - i, i // 2)])
+        frames.append(frame)
+    source = tmp_path / "transparan.gif"
+    output = tmp_path / "hasil.tif"
+    frames[0].save(source, save_all=True, append_images=frames[1:], transparency=64)
+    encode_frames(str(source), str(output), "pesan transparan")
+    assert decode_file(str(output)) == "pesan transparan"
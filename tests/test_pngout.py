@@ -0,0 +1,38 @@
+"""Uji penulis PNG NumPy (filter dan deflate multi-thread)."""
+
+import zlib
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from lsbstego.pngout import FILTERS, DeflateStream, save_image, write_png
+
+
+@pytest.mark.parametrize("filter_type", FILTERS)
+@pytest.mark.parametrize("channels", [1, 2, 3, 4])
+def test_filters_round_trip(tmp_path, filter_type, channels):
+    pixels = np.random.default_rng(channels).integers(0, 256, (23, 17, channels), dtype=np.uint8)
+    path = tmp_path / "out.png"
+    write_png(str(path), pixels, filter_type=filter_type)
+    with Image.open(path) as img:
+        assert np.array_equal(np.asarray(img).reshape(pixels.shape), pixels)
+
+
+@pytest.mark.parametrize("strategy", ["default", "filtered", "rle"])
+def test_threaded_deflate_is_one_zlib_stream(strategy):
+    # Blok kecil agar data terbagi ke banyak blok yang di-deflate paralel
+    data = np.random.default_rng(7).integers(0, 4, 50000, dtype=np.uint8).tobytes()
+    stream = DeflateStream(6, strategy, threads=4, block_bytes=4096)
+    out = b"".join(stream.compress(data[i:i + 3000]) for i in range(0, len(data), 3000))
+    out += stream.flush()
+    assert zlib.decompress(out) == data
+
+
+def test_threaded_save_round_trip(tmp_path):
+    pixels = np.random.default_rng(8).integers(0, 256, (64, 48, 3), dtype=np.uint8)
+    path = tmp_path / "out.png"
+    save_image(Image.fromarray(pixels), str(path), optimize=True, threads=4)
+    with Image.open(path) as img:
+        assert np.array_equal(np.asarray(img), pixels)
+
@@ -0,0 +1,46 @@
+"""Uji thumbnail preview dan cache LRU."""
+
+import os
+
+import numpy as np
+from PIL import Image
+
+from lsbstego.preview import LRUCache, cached_thumbnail
+
+
+def save(path, size, seed=0):
+    pixels = np.random.default_rng(seed).integers(0, 256, (size[1], size[0], 3), dtype=np.uint8)
+    Image.fromarray(pixels).save(path)
+
+
+def test_lru_evicts_oldest_within_budget():
+    cache = LRUCache(max_bytes=10)
+    cache.put("a", 1, 4)
+    cache.put("b", 2, 4)
+    cache.get("a")
+    cache.put("c", 3, 4)
+    assert "a" in cache and "c" in cache and "b" not in cache
+    cache.put("besar", 4, 11)
+    assert "besar" not in cache and cache.nbytes == 8
+
+
+def test_thumbnail_is_cached_until_file_changes(tmp_path):
+    path = tmp_path / "foto.jpg"
+    save(path, (900, 600))
+    cache = LRUCache()
+    first = cached_thumbnail(cache, str(path), (300, 300))
+    assert first.size == (300, 200)
+    assert cached_thumbnail(cache, str(path), (300, 300)) is first
+
+    save(path, (600, 900), seed=1)
+    os.utime(path, ns=(0, 1))
+    assert cached_thumbnail(cache, str(path), (300, 300)).size == (200, 300)
+
+
+def test_in_memory_thumbnail_is_stored_without_reading_file(tmp_path):
+    path = tmp_path / "hasil.png"
+    path.write_bytes(b"bukan gambar")
+    cache = LRUCache()
+    ready = Image.new("RGB", (16, 16))
+    assert cached_thumbnail(cache, str(path), (16, 16), ready) is ready
+    assert cached_thumbnail(cache, str(path), (16, 16)) is ready
@@ -0,0 +1,25 @@
+"""Uji jalur mmap untuk format tak terkompresi."""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from lsbstego import StegoError, decode_file, encode_mapped
+
+
+@pytest.mark.parametrize("key", [None, "kata sandi"])
+def test_pgm_round_trip_through_decode_file(tmp_path, key):
+    source = tmp_path / "abu.pgm"
+    output = tmp_path / "hasil.pgm"
+    Image.fromarray(np.random.default_rng(2).integers(0, 256, (40, 40), dtype=np.uint8)).save(source)
+    encode_mapped(str(source), "pesan pgm", str(output), key=key)
+    assert decode_file(str(output), key=key) == "pesan pgm"
+
+
+@pytest.mark.parametrize("header", [b"P5\n4 4 255", b"P5\n# komentar tanpa akhir",
+                                    b"P5\n4 x 255\n", b"P5"])
+def test_truncated_pnm_header_is_rejected(tmp_path, header):
+    path = tmp_path / "rusak.pgm"
+    path.write_bytes(header)
+    with pytest.raises(StegoError):
+        decode_file(str(path))
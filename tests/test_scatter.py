@@ -0,0 +1,46 @@
+"""Uji mode berkunci (permutasi Feistel)."""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from lsbstego import (FeistelPermutation, MappedImage, NoMessageError, decode_image,
+                      decode_mapped, encode_image, encode_mapped)
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 1000])
+def test_permutation_is_bijection_with_inverse(size):
+    perm = FeistelPermutation(size, "kunci")
+    indices = np.arange(size)
+    positions = perm(indices)
+    assert sorted(positions.tolist()) == list(range(size))
+    assert np.array_equal(perm.inverse(positions), indices)
+
+
+def test_different_keys_give_different_permutations():
+    assert not np.array_equal(FeistelPermutation(1000, "a")(np.arange(1000)),
+                              FeistelPermutation(1000, "b")(np.arange(1000)))
+
+
+def test_keyed_round_trip_through_bmp_mmap_view(tmp_path):
+    # Lebar 13 piksel: baris BMP diberi padding dan disimpan dari bawah, jadi view tidak kontigu
+    source = tmp_path / "sumber.bmp"
+    output = tmp_path / "hasil.bmp"
+    Image.fromarray(np.random.default_rng(5).integers(0, 256, (21, 13, 3), dtype=np.uint8)).save(source)
+    with MappedImage(str(source)) as img:
+        assert not img.pixels.flags.c_contiguous
+
+    encode_mapped(str(source), "rahasia bmp", str(output), key="kunci")
+    assert decode_mapped(str(output), key="kunci") == "rahasia bmp"
+    # Posisi bit sama dengan jalur Pillow yang memakai array kontigu
+    assert decode_image(str(output), key="kunci") == "rahasia bmp"
+    with pytest.raises(NoMessageError):
+        decode_mapped(str(output), key="kunci lain")
+
+
+def test_keyed_pillow_encode_matches_mmap_decode(tmp_path):
+    source = tmp_path / "sumber.bmp"
+    output = tmp_path / "hasil.bmp"
+    Image.fromarray(np.random.default_rng(6).integers(0, 256, (17, 11, 3), dtype=np.uint8)).save(source)
+    encode_image(str(source), "dari pillow", key="kunci").save(output)
+    assert decode_mapped(str(output), key="kunci") == "dari pillow"
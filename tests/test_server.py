@@ -0,0 +1,129 @@
+"""Uji layanan HTTP asyncio."""
+
+import asyncio
+import http.client
+import io
+import json
+
+import numpy as np
+from PIL import Image
+
+from lsbstego import StegoServer
+
+
+def fetch(port, method, target, body=None):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    try:
+        connection.request(method, target, body=body)
+        response = connection.getresponse()
+        return response.status, response.read()
+    finally:
+        connection.close()
+
+
+async def request(port, method, target, body=None):
+    return await asyncio.to_thread(fetch, port, method, target, body)
+
+
+def run_server(scenario, **options):
+    async def main():
+        server = StegoServer(workers=1, **options)
+        listener = await server.start("127.0.0.1", 0)
+        try:
+            return await scenario(server, listener.sockets[0].getsockname()[1])
+        finally:
+            await server.close()
+    return asyncio.run(main())
+
+
+def png_bytes():
+    buffer = io.BytesIO()
+    pixels = np.random.default_rng(8).integers(0, 256, (32, 32, 3), dtype=np.uint8)
+    Image.fromarray(pixels).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_encode_decode_round_trip():
+    async def scenario(server, port):
+        status, encoded = await request(port, "POST", "/encode?message=halo", png_bytes())
+        assert status == 200
+        return await request(port, "POST", "/decode", encoded)
+    assert run_server(scenario) == (200, b"halo")
+
+
+def test_unreadable_image_is_client_error_without_server_paths():
+    async def scenario(server, port):
+        return await request(port, "POST", "/decode", b"bukan gambar")
+    status, body = run_server(scenario)
+    assert status == 422
+    error = json.loads(body)["error"]
+    assert "lsbstego-" not in error and "/" not in error
+
+
+def test_connection_close_gets_eof():
+    async def scenario(server, port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"POST /decode HTTP/1.1\r\nHost: test\r\nConnection: close\r\n"
+                     b"Content-Length: 2\r\n\r\nxx")
+        data = await asyncio.wait_for(reader.read(), 10)
+        writer.close()
+        return data
+    assert run_server(scenario).startswith(b"HTTP/1.1 422")
+
+
+async def hold_slot(port, body):
+    """Mengirim header dan separuh body, sehingga request menahan satu slot."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"POST /decode HTTP/1.1\r\nHost: test\r\nConnection: close\r\n"
+                 + f"Content-Length: {len(body)}\r\n\r\n".encode() + body[:len(body) // 2])
+    await writer.drain()
+    return reader, writer
+
+
+async def wait_until(condition):
+    for _ in range(500):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("kondisi tidak tercapai")
+
+
+def test_full_queue_is_rejected_with_503():
+    async def scenario(server, port):
+        body = png_bytes()
+        reader, writer = await hold_slot(port, body)
+        await wait_until(lambda: server.metrics.in_flight == 1)
+        rejected = await request(port, "POST", "/decode", body)
+        # Slot dilepas setelah body lengkap; request berikutnya diterima lagi
+        writer.write(body[len(body) // 2:])
+        held = await asyncio.wait_for(reader.read(), 30)
+        writer.close()
+        after = await request(port, "POST", "/decode", body)
+        return rejected, held, after, server.metrics.counters["rejected"]
+
+    rejected, held, after, count = run_server(scenario, max_in_flight=1, max_queue=0)
+    assert rejected[0] == 503
+    assert held.startswith(b"HTTP/1.1 422")
+    assert after[0] == 422
+    assert count == 1
+
+
+def test_queued_request_waits_for_free_slot():
+    async def scenario(server, port):
+        body = png_bytes()
+        reader, writer = await hold_slot(port, body)
+        await wait_until(lambda: server.metrics.in_flight == 1)
+        queued = asyncio.ensure_future(request(port, "POST", "/decode", body))
+        await wait_until(lambda: server.metrics.queued == 1)
+        status, metrics = await request(port, "GET", "/metrics")
+        rejected = await request(port, "POST", "/decode", body)
+        assert not queued.done()
+        writer.write(body[len(body) // 2:])
+        await asyncio.wait_for(reader.read(), 30)
+        writer.close()
+        return json.loads(metrics), rejected, await asyncio.wait_for(queued, 30)
+
+    metrics, rejected, queued = run_server(scenario, max_in_flight=1, max_queue=1)
+    assert (metrics["in_flight"], metrics["queued"]) == (1, 1)
+    assert rejected[0] == 503
+    assert queued[0] == 422
@@ -0,0 +1,65 @@
+"""Uji codec streaming per strip."""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from lsbstego import decode_stream, encode_image, encode_stream
+from lsbstego.stream import PngStripReader, iter_strips
+
+
+def carrier(path, shape=(70, 50, 3), seed=4):
+    pixels = np.random.default_rng(seed).integers(0, 256, shape, dtype=np.uint8)
+    Image.fromarray(pixels).save(path)
+    return pixels
+
+
+def test_encode_in_place_keeps_source_on_success(tmp_path):
+    path = tmp_path / "gambar.png"
+    carrier(path)
+    encode_stream(str(path), str(path), "timpa sendiri", rows=8)
+    assert decode_stream(str(path), rows=8) == "timpa sendiri"
+    assert [p.name for p in tmp_path.iterdir()] == ["gambar.png"]
+
+
+def test_failed_encode_leaves_existing_output(tmp_path):
+    path = tmp_path / "gambar.png"
+    original = carrier(path)
+
+    def cancel(done, total):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        encode_stream(str(path), str(path), "batal", rows=8, progress=cancel)
+    assert np.array_equal(np.asarray(Image.open(path)), original)
+    assert [p.name for p in tmp_path.iterdir()] == ["gambar.png"]
+
+
+@pytest.mark.parametrize("mode", ["L", "LA", "RGB", "RGBA", "P"])
+@pytest.mark.parametrize("rows", [1, 7, 64])
+def test_strip_reader_matches_pillow(tmp_path, mode, rows):
+    path = tmp_path / "sumber.png"
+    pixels = np.random.default_rng(1).integers(0, 256, (45, 31, 3), dtype=np.uint8)
+    # Separuh atas gradien agar Pillow memakai filter selain None
+    pixels[:20] = np.arange(31, dtype=np.uint8)[None, :, None] * 8
+    Image.fromarray(pixels).convert(mode).save(path, optimize=True)
+    assert PngStripReader.supports(str(path))
+
+    (width, height), strips = iter_strips(str(path), rows)
+    decoded = np.concatenate(list(strips))
+    with Image.open(path) as img:
+        assert (width, height) == img.size
+        assert np.array_equal(decoded, np.asarray(img.convert("RGB")))
+
+
+@pytest.mark.parametrize("suffix", [".png", ".bmp"])
+@pytest.mark.parametrize("rows", [1, 5, None])
+def test_strip_round_trip_matches_whole_image_codec(tmp_path, suffix, rows):
+    source = tmp_path / f"sumber{suffix}"
+    output = tmp_path / "hasil.png"
+    carrier(source, shape=(33, 29, 3))
+    message = "pesan melintasi batas strip " * 8
+    encode_stream(str(source), str(output), message, rows=rows, filter_type="paeth")
+    assert decode_stream(str(output), rows=rows) == message
+    expected = np.asarray(encode_image(str(source), message))
+    assert np.array_equal(np.asarray(Image.open(output)), expected)